@@ -1,6 +1,13 @@
 import logging
+from typing import List, Optional, Tuple
 from src import *
 from src.logger import logger
+from src.board import (
+    default_decision_state,
+    save_decision_state,
+    load_decision_state,
+    mirror_observation,
+)
 from kaggle_environments.envs.football.helpers import GameMode, Action
 
 logging.raiseExceptions = False
@@ -31,8 +38,71 @@ def find_next_command(b: Board):
         return without_ball_action(b)
 
 
+_BOARD = None
+
+
 def agent(obs):
-    b = Board(obs["players_raw"][0])
+    global _BOARD
+    if _BOARD is None:
+        _BOARD = Board(obs["players_raw"][0])
+    else:
+        _BOARD.update(obs["players_raw"][0])
+
+    b = _BOARD
     command = find_next_command(b)
     logger.info(f"Send command: {command.name}.")
     return [command.value]
+
+
+def agent_step(obs, state: Optional[Tuple[Optional[Board], dict]] = None):
+    """
+    Action for one observation of a game which keeps its own state, e.g. a team in self-play.
+
+    The state is (board, decision state), None means the start of a game. The action is the same
+    agent() gives in the same state, the global state of agent() is kept. The board of the state
+    is updated in place, continue the game with the returned state.
+    """
+    global _BOARD
+
+    saved_state = _BOARD, save_decision_state()
+
+    if state is None:
+        state = None, default_decision_state()
+    _BOARD, decision_state = state
+    load_decision_state(decision_state)
+
+    try:
+        action = agent(obs)
+        new_state = _BOARD, save_decision_state()
+    finally:
+        _BOARD, decision_state = saved_state
+        load_decision_state(decision_state)
+
+    return action, new_state
+
+
+def self_play(
+    obs,
+    right_active: int,
+    right_sticky_actions: Optional[List[int]] = None,
+    states: Optional[List] = None,
+):
+    """
+    Actions of both teams for one observation of the left team.
+
+    The right team plays with the mirrored observation, its action is in its own
+    coordinates, as the environment expects it. Every team keeps its own state, see agent_step.
+
+    Returns the actions and the new states of both teams.
+    """
+    mirrored = mirror_observation(
+        obs["players_raw"][0], right_active, sticky_actions=right_sticky_actions
+    )
+    if states is None:
+        states = [None, None]
+
+    results = [
+        agent_step(team_obs, state)
+        for team_obs, state in zip([obs, {"players_raw": [mirrored]}], states)
+    ]
+    return [action for action, _ in results], [state for _, state in results]
@@ -15,10 +15,15 @@ def write_file(file_name, out_file):
     out_file.write("#" * 40 + "\n")
 
     with open(file_name, "r") as file:
+        import_block = False  # inside the parentheses of a wrapped local import
         for line in file.readlines():
-            if re.match(
+            if import_block or re.match(
                 "from \..* import .*|from src import .*|from src.* import .*", line
             ):
+                if not import_block:
+                    import_block = line.rstrip().endswith("(")
+                elif ")" in line:
+                    import_block = False
                 line = f"# {line}"
 
             if line.startswith("IS_KAGGLE = False"):
@@ -53,12 +58,20 @@ def main(out_file_name):
     shutil.copyfile("agent.py", os.path.join(source_dir, "agent.py"))
 
     with open(submission_file, "w") as out_file:
-        files = ["logger.py", "portion.py", "geometry.py", "models.py", "board.py"]
+        files = [
+            "logger.py",
+            "portion.py",
+            "geometry.py",
+            "models.py",
+            "board.py",
+        ]
+        # no handler uses these yet
+        skipped = ["pitch_control.py"]
         for file in files:
             write_file("src/" + file, out_file)
 
         for file_name in glob("src/*.py"):
-            if os.path.basename(file_name) in files:
+            if os.path.basename(file_name) in files + skipped:
                 continue
 
             write_file(file_name, out_file)
@@ -1,12 +1,13 @@
-from typing import Dict, List, Union
-from collections import Counter
+from copy import deepcopy
+from typing import Dict, List, Optional, Tuple, Union
+from collections import Counter, deque
 from kaggle_environments.envs.football.helpers import (
     GameMode,
     PlayerRole,
     sticky_index_to_action,
 )
 
-from .models import Player, Ball
+from .models import Player, Ball, BallRace
 from .logger import logger
 from .geometry import *
 
@@ -38,12 +39,197 @@ DRIBBLE_COMMANDS = {
     Action.ReleaseDribble,
 }
 
+
+class CommandHistory:
+    """
+    Last commands in a fixed-size ring buffer with running counts of every action.
+    """
+
+    def __init__(self, size: int = 32):
+        self.size = size
+        self._commands: List[Tuple[Optional[Action], int]] = [(None, 1)] * size
+        self._counts = Counter()
+        self._count = 0
+        self.steps_since_shot = np.inf
+
+    def __len__(self):
+        # number of commands since the last reset, not bounded by the buffer size
+        return self._count
+
+    def clear(self):
+        self._commands = [(None, 1)] * self.size
+        self._counts.clear()
+        self._count = 0
+        self.steps_since_shot = np.inf
+
+    def append(self, action: Optional[Action], power: int):
+        i = self._count % self.size
+        if self._count >= self.size:
+            self._counts[self._commands[i][0]] -= 1
+
+        self._commands[i] = (action, power)
+        self._counts[action] += 1
+        self._count += 1
+
+        if action == Action.Shot:
+            self.steps_since_shot = 0
+        else:
+            self.steps_since_shot += 1
+
+    def last(self) -> Optional[Tuple[Optional[Action], int]]:
+        if not self._count:
+            return None
+        return self._commands[(self._count - 1) % self.size]
+
+    def count(self, action: Optional[Action], n: int) -> int:
+        """
+        How many times the action was sent among the last n commands.
+
+        Scans the last n entries, unless the action is not in the buffer at all.
+        """
+        if n > self.size:
+            raise ValueError(f"Can't look {n} commands back, history size is {self.size}.")
+
+        if not self._counts[action]:
+            return 0
+
+        c = 0
+        for i in range(self._count - 1, max(self._count - n, 0) - 1, -1):
+            if self._commands[i % self.size][0] == action:
+                c += 1
+        return c
+
+
+class SearchHints:
+    """
+    Which searches of control_action failed the last time they ran, "shot" or "pass".
+
+    A hint only orders the work, it never decides: after a failed search the cheap check
+    (may_shoot, may_pass) runs first and the search is skipped only if the check rules it out.
+    The hints are cleared with the rest of the state when the strategy is switched.
+    """
+
+    def __init__(self):
+        self._failed: Dict[str, bool] = {}
+
+    def __repr__(self):
+        return f"SearchHints(failed={sorted(n for n, f in self._failed.items() if f)})"
+
+    def failed(self, name: str) -> bool:
+        return self._failed.get(name, False)
+
+    def set(self, name: str, failed: bool):
+        self._failed[name] = failed
+
+    def clear(self):
+        self._failed.clear()
+
+
 _TARGET = None
 _LAST_PLAYER = None
 _LAST_BALL_PLAYER = None
-_LAST_COMMANDS = []
+_LAST_COMMANDS = CommandHistory()
 _FREEZED_DIRECTION_COUNT = 0
 _AVAILABLE_DIRECTIONS = DIRECTION_COMMANDS
+_SEARCH_HINTS = SearchHints()
+
+
+def default_decision_state() -> dict:
+    """
+    Decision state at the start of the game.
+    """
+    return dict(
+        target=None,
+        last_player=None,
+        last_ball_player=None,
+        last_commands=CommandHistory(),
+        freezed_direction_count=0,
+        available_directions=DIRECTION_COMMANDS,
+        search_hints=SearchHints(),
+    )
+
+
+def save_decision_state() -> dict:
+    """
+    Copy of the module-level state which is carried between the steps.
+    """
+    return dict(
+        target=_TARGET,
+        last_player=_LAST_PLAYER,
+        last_ball_player=_LAST_BALL_PLAYER,
+        last_commands=deepcopy(_LAST_COMMANDS),
+        freezed_direction_count=_FREEZED_DIRECTION_COUNT,
+        available_directions=_AVAILABLE_DIRECTIONS,  # never changed in place
+        search_hints=deepcopy(_SEARCH_HINTS),
+    )
+
+
+def load_decision_state(state: dict):
+    global _TARGET, _LAST_PLAYER, _LAST_BALL_PLAYER, _LAST_COMMANDS, _FREEZED_DIRECTION_COUNT, _AVAILABLE_DIRECTIONS, _SEARCH_HINTS
+    _TARGET = state["target"]
+    _LAST_PLAYER = state["last_player"]
+    _LAST_BALL_PLAYER = state["last_ball_player"]
+    _LAST_COMMANDS = deepcopy(state["last_commands"])
+    _FREEZED_DIRECTION_COUNT = state["freezed_direction_count"]
+    _AVAILABLE_DIRECTIONS = state["available_directions"]
+    if _AVAILABLE_DIRECTIONS == DIRECTION_COMMANDS:
+        # keep the iteration order of the default set
+        _AVAILABLE_DIRECTIONS = DIRECTION_COMMANDS
+    _SEARCH_HINTS = deepcopy(state["search_hints"])
+
+
+TEAM_FIELDS = ("team", "team_direction", "team_roles", "team_tired_factor", "team_active", "team_yellow_card")
+
+
+def mirror_observation(obs, active: int, sticky_actions: Optional[List[int]] = None) -> dict:
+    """
+    The observation (players_raw[0] format) from the right team's point of view.
+
+    The pitch is turned around the center: x and y change their signs, the teams
+    and the ball owner are swapped. The active player and the sticky actions of the right
+    team aren't in the observation of the left one, so they are given separately.
+    """
+    mirrored = dict(obs)
+    for field in TEAM_FIELDS:
+        left, right = obs[f"left_{field}"], obs[f"right_{field}"]
+        if field in ("team", "team_direction"):
+            left, right = (-np.asarray(left)).tolist(), (-np.asarray(right)).tolist()
+        mirrored[f"left_{field}"], mirrored[f"right_{field}"] = right, left
+
+    for field in ("ball", "ball_direction", "ball_rotation"):
+        if field in obs:
+            x, y, z = obs[field]
+            mirrored[field] = [-x, -y, z]
+
+    ball_owned_team = obs["ball_owned_team"]
+    mirrored["ball_owned_team"] = 1 - ball_owned_team if ball_owned_team >= 0 else -1
+    mirrored["score"] = list(reversed(obs["score"]))
+    mirrored["active"] = active
+    if "designated" in obs:
+        mirrored["designated"] = active
+    mirrored["sticky_actions"] = list(sticky_actions or [0] * len(obs["sticky_actions"]))
+    return mirrored
+
+
+class _TeamField:
+    """
+    Board attribute of a team which is brought up to date on the first access.
+
+    While the attribute is in the instance dict it is read directly, so eagerly updated
+    boards don't pay for the laziness.
+    """
+
+    def __init__(self, side: str):
+        self.side = side
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, board, owner=None):
+        if board is None:
+            return self
+        board._sync_team(self.side)
+        return board.__dict__[self.name]
 
 
 class Board:
@@ -64,8 +250,83 @@ class Board:
         Point(x_max, -0.073 / 2 * _y_scale),
         Point(x_max, 0.073 / 2 * _y_scale),
     )
+    # the attacking half, close to the goal line the post angles are computed exactly
+    goal_visibility = GoalVisibility(opponent_posts, Field(0, x_max - 0.1, y_min, y_max))
+
+    # set pieces only read the ball and a few players, the teams are updated on demand
+    lazy_game_modes = {
+        GameMode.GoalKick,
+        GameMode.FreeKick,
+        GameMode.Corner,
+        GameMode.ThrowIn,
+        GameMode.Penalty,
+        GameMode.KickOff,
+    }
+
+    _team_fields = {
+        "left": (
+            "my_team",
+            "my_gk",
+            "my_positions",
+            "my_vectors",
+            "my_previous_vectors",
+            "my_accelerations",
+        ),
+        "right": (
+            "opponent_team",
+            "opponent_gk",
+            "opponent_positions",
+            "opponent_vectors",
+            "opponent_previous_vectors",
+            "opponent_accelerations",
+        ),
+    }
+    my_team = _TeamField("left")
+    my_gk = _TeamField("left")
+    my_positions = _TeamField("left")
+    my_vectors = _TeamField("left")
+    my_previous_vectors = _TeamField("left")
+    my_accelerations = _TeamField("left")
+    opponent_team = _TeamField("right")
+    opponent_gk = _TeamField("right")
+    opponent_positions = _TeamField("right")
+    opponent_vectors = _TeamField("right")
+    opponent_previous_vectors = _TeamField("right")
+    opponent_accelerations = _TeamField("right")
 
     def __init__(self, obs):
+        self.my_team: Dict[int, Player] = {}
+        self.opponent_team: Dict[int, Player] = {}
+        self.my_gk = None
+        self.opponent_gk = None
+        self.ball = None
+
+        # per-team kinematic arrays, indexed by player id
+        self.my_positions = self.my_vectors = None
+        self.my_previous_vectors = self.my_accelerations = None
+        self.opponent_positions = self.opponent_vectors = None
+        self.opponent_previous_vectors = self.opponent_accelerations = None
+
+        self.controlled_player = None
+
+        self._raw = {}  # field name -> last seen raw value
+        self.steps_left = None
+
+        # observations the team wasn't updated with, the last two are enough for accelerations
+        self._pending = {side: deque(maxlen=2) for side in self._team_fields}
+        self._hidden = {side: {} for side in self._team_fields}
+        self._team_steps_left = {side: None for side in self._team_fields}
+
+        self.update(obs)
+
+    def update(self, obs) -> "Board":
+        """
+        Move the board to the next observation.
+
+        Player and ball objects are updated in place, derived data (gk lookups,
+        sticky actions, team dicts) is only recomputed if its source fields changed.
+        In the lazy game modes a team is updated on the first access to its fields.
+        """
         self.step = 3001 - obs["steps_left"]
         self.steps_left = obs["steps_left"]
         self.game_mode = GameMode(obs["game_mode"])
@@ -75,17 +336,23 @@ class Board:
         logger.info(f"Step {self.step}.")
         logger.info(f"Mode={self.game_mode.name}, score={self.score}.")
 
-        self.my_team = self._get_team(obs, "left")
-        self.my_gk = self._find_gk(self.my_team.values())
-        self.opponent_team = self._get_team(obs, "right")
-        self.opponent_gk = self._find_gk(self.opponent_team.values())
-        self.ball = self._get_ball(obs)
-        self.controlled_player = self.my_team[obs["active"]]
-        self.sticky_actions = {
-            sticky_index_to_action[nr]
-            for nr, action in enumerate(obs["sticky_actions"])
-            if action
-        }
+        lazy = self.game_mode in self.lazy_game_modes
+        for side in self._team_fields:
+            self._pending[side].append(obs)
+            if lazy:
+                self._hide_team(side)
+            else:
+                self._sync_team(side)
+
+        self.controlled_player = self._current_player(obs, "left", obs["active"])
+        self._update_ball(obs)
+
+        if self._raw_changed(obs, "sticky_actions"):
+            self.sticky_actions = {
+                sticky_index_to_action[nr]
+                for nr, action in enumerate(obs["sticky_actions"])
+                if action
+            }
 
         logger.info(
             f"Controlled player: {self.controlled_player}, "
@@ -99,8 +366,13 @@ class Board:
             logger.info(f"The {self.ball} controlled by my {self.ball.player}.")
 
         self.next_action = None
+        self._pitch_control = None  # see pitch_control.pitch_control
+        self._ball_race = None
+        self._update_strategy()
+        return self
 
-        global _TARGET, _LAST_PLAYER, _LAST_BALL_PLAYER, _LAST_COMMANDS, _AVAILABLE_DIRECTIONS, _FREEZED_DIRECTION_COUNT
+    def _update_strategy(self):
+        global _TARGET, _LAST_PLAYER, _LAST_BALL_PLAYER, _AVAILABLE_DIRECTIONS, _FREEZED_DIRECTION_COUNT
         ball_player = self.ball.player
         ball_player = ball_player.id if ball_player else None
 
@@ -117,7 +389,8 @@ class Board:
             _TARGET = None
             _LAST_PLAYER = self.controlled_player.id
             _LAST_BALL_PLAYER = ball_player
-            _LAST_COMMANDS = []
+            _LAST_COMMANDS.clear()
+            _SEARCH_HINTS.clear()
             _FREEZED_DIRECTION_COUNT = 0
             _AVAILABLE_DIRECTIONS = DIRECTION_COMMANDS  # | {Action.ReleaseDirection}
 
@@ -130,55 +403,162 @@ class Board:
         if _TARGET is not None:
             self.available_directions = {self.__find_target_direction(_TARGET)}
 
-    def _get_team(self, obs, side: str) -> Dict[int, Player]:
+    @property
+    def search_hints(self) -> SearchHints:
+        return _SEARCH_HINTS
+
+    def _hide_team(self, side: str):
+        hidden = self._hidden[side]
+        for name in self._team_fields[side]:
+            if name in self.__dict__:
+                hidden[name] = self.__dict__.pop(name)
+
+    def _sync_team(self, side: str):
+        """
+        Update the team with the pending observations.
+        """
+        self.__dict__.update(self._hidden[side])
+        self._hidden[side].clear()
+
+        pending = self._pending[side]
+        while pending:
+            obs = pending.popleft()
+            steps_left = self._team_steps_left[side]
+            consecutive = steps_left is not None and steps_left - 1 == obs["steps_left"]
+            self._update_team(obs, side, consecutive)
+            self._team_steps_left[side] = obs["steps_left"]
+
+    def _current_player(self, obs, side: str, id: int) -> Player:
+        """
+        The player with the data of the observation, the rest of a lazy team isn't updated.
+        """
+        team_name = self._team_fields[side][0]
+        if self._pending[side]:
+            team = self._hidden[side].get(team_name)
+            player = team.get(id) if team else None
+            if player is not None:
+                self._update_player(
+                    player,
+                    obs[f"{side}_team"][id],
+                    obs[f"{side}_team_direction"][id],
+                    obs[f"{side}_team_tired_factor"][id],
+                    obs[f"{side}_team_yellow_card"][id],
+                )
+                return player
+
+        return getattr(self, team_name)[id]
+
+    def _update_player(self, player: Player, position, vector, tired_factor, yellow_card):
+        player.update(
+            Point(x=position[0], y=-position[1] * self._y_scale),
+            Vector(x=vector[0], y=-vector[1] * self._y_scale),
+            tired_factor,
+            yellow_card,
+        )
+
+    def _raw_changed(self, obs, key: str) -> bool:
+        value = tuple(obs[key])
+        if self._raw.get(key) == value:
+            return False
+        self._raw[key] = value
+        return True
+
+    def _update_team(self, obs, side: str, consecutive: bool = False):
         if side not in ("left", "right"):
             raise ValueError(f"Unknown team side '{side}'.")
 
         is_opponent = side == "right"
-
-        return {
-            id: Player(
-                id=id,
-                position=Point(x=p[0], y=-p[1] * self._y_scale),
-                vector=Vector(x=d[0], y=-d[1] * self._y_scale),
-                role=PlayerRole(r),
-                tired_factor=tf,
-                yellow_card=yc,
-                is_opponent=is_opponent,
-            )
-            for id, (p, d, r, tf, active, yc) in enumerate(
-                zip(
-                    obs[f"{side}_team"],
-                    obs[f"{side}_team_direction"],
-                    obs[f"{side}_team_roles"],
-                    obs[f"{side}_team_tired_factor"],
-                    obs[f"{side}_team_active"],
-                    obs[f"{side}_team_yellow_card"],
+        prefix = "opponent" if is_opponent else "my"
+
+        raw_positions = obs[f"{side}_team"]
+        raw_vectors = obs[f"{side}_team_direction"]
+
+        positions = getattr(self, f"{prefix}_positions")
+        if positions is None or len(positions) != len(raw_positions):
+            positions = np.zeros((len(raw_positions), 2))
+            setattr(self, f"{prefix}_positions", positions)
+            for name in ("vectors", "previous_vectors", "accelerations"):
+                setattr(self, f"{prefix}_{name}", np.zeros_like(positions))
+            consecutive = False
+
+        vectors = getattr(self, f"{prefix}_vectors")
+        previous_vectors = getattr(self, f"{prefix}_previous_vectors")
+        accelerations = getattr(self, f"{prefix}_accelerations")
+
+        positions[:] = raw_positions
+        positions[:, 1] *= -self._y_scale
+        previous_vectors[:] = vectors
+        vectors[:] = raw_vectors
+        vectors[:, 1] *= -self._y_scale
+        if consecutive:
+            np.subtract(vectors, previous_vectors, out=accelerations)
+        else:
+            previous_vectors[:] = vectors
+            accelerations.fill(0)
+
+        team = getattr(self, f"{prefix}_team")
+        active_changed = self._raw_changed(obs, f"{side}_team_active")
+        roles_changed = self._raw_changed(obs, f"{side}_team_roles")
+
+        if active_changed:
+            team = {
+                id: team.get(id) or Player(
+                    id=id,
+                    position=None,
+                    vector=None,
+                    role=PlayerRole(obs[f"{side}_team_roles"][id]),
+                    is_opponent=is_opponent,
                 )
+                for id, active in enumerate(obs[f"{side}_team_active"])
+                if active
+            }
+            setattr(self, f"{prefix}_team", team)
+
+        roles = obs[f"{side}_team_roles"]
+        tired_factors = obs[f"{side}_team_tired_factor"]
+        yellow_cards = obs[f"{side}_team_yellow_card"]
+        for id, player in team.items():
+            self._update_player(
+                player, raw_positions[id], raw_vectors[id], tired_factors[id], yellow_cards[id]
             )
-            if active
-        }
+            if roles_changed or active_changed:
+                player.role = PlayerRole(roles[id])
 
-    def _get_ball(self, obs) -> Ball:
+        if roles_changed or active_changed:
+            setattr(self, f"{prefix}_gk", self._find_gk(team.values()))
+
+    def _update_ball(self, obs):
         ball_owned_team = obs["ball_owned_team"]
         ball_owned_player = obs["ball_owned_player"]
 
         if ball_owned_team == 0:
-            player = self.my_team[ball_owned_player]
+            player = self._current_player(obs, "left", ball_owned_player)
         elif ball_owned_team == 1:
-            player = self.opponent_team[ball_owned_player]
+            player = self._current_player(obs, "right", ball_owned_player)
         else:
             player = None
 
         p = obs["ball"]
         d = obs["ball_direction"]
-        return Ball(
-            position=Point(x=p[0], y=-p[1] * self._y_scale),
-            altitude=p[2],
-            vector=Vector(x=d[0], y=-d[1] * self._y_scale),
-            vertical_speed=d[2],
-            player=player,
-        )
+        position = Point(x=p[0], y=-p[1] * self._y_scale)
+        vector = Vector(x=d[0], y=-d[1] * self._y_scale)
+
+        if self.ball is None:
+            self.ball = Ball(
+                position=position,
+                altitude=p[2],
+                vector=vector,
+                vertical_speed=d[2],
+                player=player,
+            )
+        else:
+            self.ball.update(
+                position=position,
+                altitude=p[2],
+                vector=vector,
+                vertical_speed=d[2],
+                player=player,
+            )
 
     @staticmethod
     def _find_gk(players) -> Player:
@@ -192,6 +572,15 @@ class Board:
         else:
             return self.my_team[id]
 
+    @property
+    def ball_race(self) -> BallRace:
+        """
+        Intercept intervals of the ball for all players, built on first access in the step.
+        """
+        if self._ball_race is None:
+            self._ball_race = BallRace(self)
+        return self._ball_race
+
     def is_my_player_control_the_ball(self) -> bool:
         return self.controlled_player == self.ball.player
 
@@ -223,26 +612,21 @@ class Board:
 
     @staticmethod
     def _add_command(action, power):
-        global _LAST_COMMANDS
-        _LAST_COMMANDS.append((action, power))
+        _LAST_COMMANDS.append(action, power)
 
     @staticmethod
-    def _last_commands(n: int = 10, p: int = 1) -> List[Action]:
-        global _LAST_COMMANDS
-        i = n + p
-        counter = Counter([a for a, _ in _LAST_COMMANDS[-i:]])
-        return [x for x, c in counter.items() if c >= p]
+    def _is_repeated_command(action, n: int = 10, p: int = 1) -> bool:
+        return _LAST_COMMANDS.count(action, n + p) >= p
 
     @property
     def command_count(self) -> int:
-        global _LAST_COMMANDS
         return len(_LAST_COMMANDS)
 
     @staticmethod
     def _maybe_freezed_commands():
-        global _LAST_COMMANDS
-        if _LAST_COMMANDS:
-            action, power = _LAST_COMMANDS[-1]
+        last_command = _LAST_COMMANDS.last()
+        if last_command:
+            action, power = last_command
             if action:
                 power -= 1
                 if power > 0:
@@ -254,7 +638,7 @@ class Board:
         if old_action:
             return old_action, old_power
 
-        if new_action and new_action in self._last_commands(p=new_power):
+        if new_action and self._is_repeated_command(new_action, p=new_power):
             return None, 1
 
         return new_action, new_power
@@ -295,8 +679,8 @@ class Board:
 
     @staticmethod
     def _can_handle_action():
-        global _FREEZED_DIRECTION_COUNT, _LAST_COMMANDS
-        return _FREEZED_DIRECTION_COUNT == 0 and Action.Shot not in _LAST_COMMANDS[-10:]
+        global _FREEZED_DIRECTION_COUNT
+        return _FREEZED_DIRECTION_COUNT == 0 and _LAST_COMMANDS.steps_since_shot >= 10
 
     def set_action(
         self,
@@ -1,22 +1,43 @@
+from typing import List, Optional
 from kaggle_environments.envs.football.helpers import PlayerRole
 
 from .board import Board
 from .logger import logger
-from .models import Player, speed_interval, field_interval
+from .models import (
+    INTERCEPT_BOUND_SLACK,
+    Player,
+    field_times,
+    first_intercept_time,
+    first_intercept_times,
+)
 from .geometry import *
-from .pass_targeting import make_pass, make_shot
+from .pass_features import PassFeatures
+from .pass_targeting import make_pass, make_shot, may_pass, may_shoot
 
 
 def control_action(board: Board) -> Action:
+    hints = board.search_hints
+    player = board.controlled_player
     vector, speed = _make_move(board)
 
-    shot_action = make_shot(board, player=board.controlled_player, speed=speed)
-    if shot_action:
-        return shot_action
-
-    pass_action = make_pass(board, player=board.controlled_player, speed=speed)
-    if pass_action:
-        return pass_action
+    # after a failed search its cheap check goes first, it rules the action out
+    # only if the search would fail again
+    if not hints.failed("shot") or may_shoot(board, player):
+        shot_action = make_shot(board, player=player, speed=speed)
+        hints.set("shot", shot_action is None)
+        if shot_action:
+            return shot_action
+
+    pass_features = None
+    if hints.failed("pass"):
+        pass_features = PassFeatures(board, player)
+    if pass_features is None or may_pass(board, player, pass_features):
+        pass_action = make_pass(
+            board, player=player, speed=speed, pass_features=pass_features
+        )
+        hints.set("pass", pass_action is None)
+        if pass_action:
+            return pass_action
 
     return board.set_action(action=None, vector=vector, sprint=speed)
 
@@ -56,33 +77,41 @@ def _get_best_move(board: Board, target_vector: Vector, time_th=15):
 
     my_goal_line = Line(goal_position - Point(0, 0.2), goal_position + Point(0, 0.2))
 
+    movements = [
+        (stick, speed, player.apply(stick, speed))
+        for stick in board.available_directions
+        for speed in (True, False)
+    ]
+    players = [p for _, _, p in movements]
+    keeper_times = __keeper_times(board, players)
+    exit_times = __field_times(board, players)
+    # the scores are capped at time_th, the opponents who can't get under it are skipped
+    reachable = __reachable_opponents(board, players, time_th)
+
     movement_to_player = {}
     logger.debug("Find best move:")
-    for stick in board.available_directions:
-        for speed in (True, False):
-            p = player.apply(stick, speed)
-
-            opponent_time = __opponent_time(board, p)
-            field_time = __field_time(board, p)
-            keeper_time = __keeper_time(board, p)
-
-            if my_goal_distance < 0.4 and my_goal_line.there_is_an_intersection(
-                p.position, p.vector
-            ):
-                # penalty if a player move to our post
-                field_time /= 2
-
-            movement_to_player[(stick, speed)] = {
-                "player": p,
-                "opponent_time": opponent_time,
-                "field_time": field_time,
-                "keeper_time": keeper_time,
-            }
-            logger.debug(
-                f" -- Direction={stick}, speed={speed}: "
-                f"vector={p.vector}, opponent_time={round(opponent_time, 1)}, "
-                f"field_time={round(field_time, 1)}, keeper_time={round(keeper_time, 1)}."
-            )
+    for (stick, speed, p), keeper_time, field_time, opponents in zip(
+        movements, keeper_times, exit_times, reachable
+    ):
+        opponent_time = __opponent_time(board, p, opponents)
+
+        if my_goal_distance < 0.4 and my_goal_line.there_is_an_intersection(
+            p.position, p.vector
+        ):
+            # penalty if a player move to our post
+            field_time /= 2
+
+        movement_to_player[(stick, speed)] = {
+            "player": p,
+            "opponent_time": opponent_time,
+            "field_time": field_time,
+            "keeper_time": keeper_time,
+        }
+        logger.debug(
+            f" -- Direction={stick}, speed={speed}: "
+            f"vector={p.vector}, opponent_time={round(opponent_time, 1)}, "
+            f"field_time={round(field_time, 1)}, keeper_time={round(keeper_time, 1)}."
+        )
 
     def __get_keys_value(_field, _stick, _speed=True):
         return movement_to_player[(_stick, _speed)][_field]
@@ -123,20 +152,26 @@ def _get_best_move(board: Board, target_vector: Vector, time_th=15):
     return vector, speed
 
 
-def __opponent_time(board, player):
+def __opponent_time(board, player, opponents: Optional[List[Player]] = None):
+    """
+    The earliest time an opponent, except the goalkeeper, can take the ball
+    from the player. opponents limits the search, all of them by default.
+    """
+    if opponents is None:
+        opponents = board.opponent_team.values()
+
     min_t = np.inf
-    for x in board.opponent_team.values():
+    for x in opponents:
         if (
             x.role == PlayerRole.GoalKeeper
             or euclidean_distance(player.position, x.position) > 0.5
         ):
             continue
 
-        interval = speed_interval(player.position, player.vector, opponent=x)
-        if not interval:
+        t, opponent = first_intercept_time(player.position, player.vector, x)
+        if opponent is None:
             continue
 
-        t = interval.lower()
         if t > min_t:
             continue
 
@@ -161,17 +196,59 @@ def __opponent_time(board, player):
     return min_t
 
 
-def __keeper_time(board, player):
-    interval = speed_interval(
-        player.position, player.vector, opponent=board.opponent_gk
+def __reachable_opponents(board, players: List[Player], time_th) -> List[List[Player]]:
+    """
+    For every player the opponents, except the goalkeeper, who may get under time_th
+    in __opponent_time.
+
+    The intercept time is at least the distance from the player's line over
+    the opponent's speed. __opponent_time only makes it longer, except for
+    an intercept right at the opponent's position, which is on the line.
+    """
+    opponents = [
+        x for x in board.opponent_team.values() if x.role != PlayerRole.GoalKeeper
+    ]
+    if not opponents:
+        return [[] for _ in players]
+
+    positions = np.array([[p.x, p.y] for p in players])
+    vectors = np.array([[p.vector.x, p.vector.y] for p in players])
+    pb = positions[:, None, :] - np.array([[x.x, x.y] for x in opponents])[None, :, :]
+
+    speeds = np.hypot(vectors[:, 0], vectors[:, 1])[:, None]
+    moving = speeds > 0
+    vx, vy = vectors[:, None, 0], vectors[:, None, 1]
+    cross = np.abs(vx * pb[:, :, 1] - vy * pb[:, :, 0])
+    distances = np.where(
+        moving, cross / np.where(moving, speeds, 1), np.hypot(pb[:, :, 0], pb[:, :, 1])
+    )
+    bounds = distances / np.array([x.max_speed for x in opponents])
+    bounds *= 1 - INTERCEPT_BOUND_SLACK
+
+    return [
+        [x for x, bound in zip(opponents, row) if bound < time_th] for row in bounds
+    ]
+
+
+def __keeper_times(board, players: List[Player]) -> np.ndarray:
+    if not players:
+        return np.array([])
+
+    times, _ = first_intercept_times(
+        [[p.x, p.y] for p in players],
+        [[p.vector.x, p.vector.y] for p in players],
+        board.opponent_gk,
     )
-    if not interval:
-        return np.inf
-    return interval.lower()
+    return times
 
 
-def __field_time(board: Board, player: Player):
-    interval = field_interval(player.position, player.vector, board)
-    if not interval:
-        return np.inf
-    return interval.upper()
+def __field_times(board, players: List[Player]) -> np.ndarray:
+    if not players:
+        return np.array([])
+
+    enter, exit = field_times(
+        [[p.x, p.y] for p in players],
+        [[p.vector.x, p.vector.y] for p in players],
+        board,
+    )
+    return np.where(enter <= exit, exit, np.inf)
@@ -1,7 +1,9 @@
 import numpy as np
-from typing import Optional
+from typing import List, Optional, Tuple, Union
 from kaggle_environments.envs.football.helpers import Action
 
+from .portion import Interval
+
 _c45 = np.sqrt(2) / 2
 
 _DIRECTION_TO_VECTOR = {
@@ -34,14 +36,37 @@ def angle_to_direction(angle: float, grade: bool = True) -> Action:
 
 
 class Point:
+    """
+    Immutable point, the operators return new objects, so points can be shared and used as keys.
+    """
+
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
+        _set_x(self, x)
+        _set_y(self, y)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __reduce__(self):
+        return self.__class__, (self.x, self.y)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         return f"{self.__class__.__name__}(x={round(self.x, 2)}, y={round(self.y, 2)})"
 
     def __eq__(self, other):
+        if not isinstance(other, Point):
+            return NotImplemented
         return self.x == other.x and self.y == other.y
 
     def __add__(self, other):
@@ -66,7 +91,13 @@ class Point:
         return hash((self.x, self.y))
 
 
+# setters of the slots, the only way to assign the coordinates, faster than object.__setattr__
+_set_x, _set_y = Point.x.__set__, Point.y.__set__
+
+
 class Vector(Point):
+    __slots__ = ()
+
     def __repr__(self):
         return f"{self.__class__.__name__}(x={round(self.x, 3)}, y={round(self.y, 3)})"
 
@@ -84,7 +115,7 @@ class Vector(Point):
 
     @classmethod
     def from_direction(cls, direction: Action) -> "Vector":
-        return Vector(*_DIRECTION_TO_VECTOR[direction])
+        return _DIRECTION_VECTORS[direction]
 
     def normalize(self) -> "Vector":
         n = self.length()
@@ -133,6 +164,10 @@ class Vector(Point):
         return angle_to_direction(self.angle(), grade=False)
 
 
+# unit vectors of the eight directions, shared by all callers
+_DIRECTION_VECTORS = {d: Vector(*xy) for d, xy in _DIRECTION_TO_VECTOR.items()}
+
+
 def euclidean_distance(p1: Point, p2: Point) -> float:
     return Vector.from_point(p1 - p2).length()
 
@@ -209,6 +244,194 @@ class Line:
         return start_angle < v.angle() < end_angle
 
 
+def segment_distances(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    points: np.ndarray,
+    include_start: bool = True,
+    include_end: bool = True,
+) -> np.ndarray:
+    """
+    Line(start, end).get_short_direction(point).length() for arrays of (..., 2) coordinates,
+    which broadcast together, e.g. senders (S, 1, 1, 2), receivers (S, R, 1, 2) and opponents (O, 2)
+    give (S, R, O) distances. np.inf where get_short_direction returns None.
+    """
+    starts, ends, points = np.asarray(starts), np.asarray(ends), np.asarray(points)
+
+    ste_x = ends[..., 0] - starts[..., 0]
+    ste_y = ends[..., 1] - starts[..., 1]
+    pts_x = starts[..., 0] - points[..., 0]
+    pts_y = starts[..., 1] - points[..., 1]
+
+    ste_length = np.sqrt(ste_x ** 2 + ste_y ** 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        n_x = ste_x / ste_length
+        n_y = ste_y / ste_length
+    s = n_x * pts_x + n_y * pts_y
+    projection_x = n_x * s
+    projection_y = n_y * s
+
+    distance = np.sqrt((pts_x - projection_x) ** 2 + (pts_y - projection_y) ** 2)
+
+    before_start = projection_x * n_x + projection_y * n_y >= 0
+    after_end = ~before_start & (
+        np.sqrt(projection_x ** 2 + projection_y ** 2) >= ste_length
+    )
+    start_distance = np.sqrt(pts_x ** 2 + pts_y ** 2)
+    if include_start:
+        distance = np.where(before_start, start_distance, distance)
+    else:
+        distance = np.where(before_start, np.inf, distance)
+    if include_end:
+        end_x = ends[..., 0] - points[..., 0]
+        end_y = ends[..., 1] - points[..., 1]
+        distance = np.where(after_end, np.sqrt(end_x ** 2 + end_y ** 2), distance)
+    else:
+        distance = np.where(after_end, np.inf, distance)
+
+    same_point = (ste_x == 0) & (ste_y == 0)
+    return np.where(same_point, start_distance, distance)
+
+
+class AngularOccupancy:
+    """
+    Circular bitmap of the blocked directions around a point with 1 degree resolution.
+
+    An object at the angle with the angular half-size blocks the integer degrees
+    from round(angle - half_size) to round(angle + half_size), wrapping around ±180.
+    Angles are in degrees, as Vector.angle(grade=True).
+    """
+
+    size = 360
+
+    # direction of every degree from -180 to 179
+    _slot_directions = [angle_to_direction(d, grade=True) for d in range(-180, 180)]
+
+    def __init__(self, angles, half_sizes=0):
+        angles = np.asarray(angles, dtype=float)
+        half_sizes = np.broadcast_to(np.asarray(half_sizes, dtype=float), angles.shape)
+
+        known = np.isfinite(angles) & np.isfinite(half_sizes)
+        lower = np.round(angles[known] - half_sizes[known])
+        upper = np.round(angles[known] + half_sizes[known])
+
+        degrees = np.arange(-180, 180)
+        offset = (degrees[None, :] - lower[:, None]) % self.size
+        self.bitmap = np.any(offset <= (upper - lower)[:, None], axis=0)
+
+    def __repr__(self):
+        return f"AngularOccupancy({self.to_interval()})"
+
+    @classmethod
+    def _slot(cls, angle: float) -> int:
+        return (int(round(angle)) + 180) % cls.size
+
+    def is_blocked(self, angle: float) -> bool:
+        return bool(self.bitmap[self._slot(angle)])
+
+    def blocked_directions(self) -> set:
+        return {self._slot_directions[i] for i in np.flatnonzero(self.bitmap)}
+
+    def _runs(self, mask) -> List[Tuple[int, int]]:
+        """
+        Circular runs of True as (first, last) degrees, last < first if the run wraps around ±180.
+        """
+        if mask.all():
+            return [(-180, 179)]
+        if not mask.any():
+            return []
+
+        # start from a False slot, so no run is cut by the array borders
+        shift = int(np.argmin(mask))
+        rolled = np.concatenate([np.roll(mask, -shift), [False]]).astype(np.int8)
+        changes = np.diff(np.concatenate([[0], rolled]))
+        starts = np.flatnonzero(changes == 1)
+        ends = np.flatnonzero(changes == -1) - 1
+        return [
+            ((s + shift) % self.size - 180, (e + shift) % self.size - 180)
+            for s, e in zip(starts, ends)
+        ]
+
+    def blocked_runs(self) -> List[Tuple[int, int]]:
+        return self._runs(self.bitmap)
+
+    def free_gaps(self) -> List[Tuple[int, int]]:
+        return self._runs(~self.bitmap)
+
+    def to_interval(self) -> Interval:
+        """
+        Blocked degrees as an Interval within [-180, 180].
+        """
+        borders = []
+        for first, last in self.blocked_runs():
+            if last < first:
+                borders += [(first, 180), (-180, last)]
+            else:
+                borders.append((first, last))
+        return Interval(*borders)
+
+
+class GoalVisibility:
+    """
+    Angles from a point to the goal posts precomputed over a grid,
+    between the grid nodes they're interpolated bilinearly.
+
+    Angles are in degrees, as Vector.angle(grade=True). The angles change fast close to the posts,
+    so keep the grid away from the goal line: outside the grid they're computed exactly.
+    """
+
+    def __init__(self, posts, area: "Field", resolution: float = 0.01):
+        self.posts = tuple(posts)
+        self.resolution = resolution
+        self.x_min, self.y_min = area.x_min, area.y_min
+
+        xs = np.arange(area.x_min, area.x_max + resolution / 2, resolution)
+        ys = np.arange(area.y_min, area.y_max + resolution / 2, resolution)
+        self._max_i, self._max_j = len(xs) - 1, len(ys) - 1
+
+        # [i][j][post] python lists, indexing them with scalars is much faster than numpy arrays
+        self._angles = np.stack(
+            [
+                np.degrees(np.arctan2(post.y - ys[None, :], post.x - xs[:, None]))
+                for post in self.posts
+            ],
+            axis=-1,
+        ).tolist()
+
+    def __repr__(self):
+        return (
+            f"GoalVisibility(resolution={self.resolution}, "
+            f"shape={(self._max_i + 1, self._max_j + 1)})"
+        )
+
+    def _exact_angles(self, p: Point) -> List[float]:
+        return [Vector.from_point(post - p).angle(grade=True) for post in self.posts]
+
+    def post_angles(self, p: Point) -> List[float]:
+        """
+        Angle of the direction from the point to every post.
+        """
+        fx = (p.x - self.x_min) / self.resolution
+        fy = (p.y - self.y_min) / self.resolution
+        if not (0 <= fx <= self._max_i and 0 <= fy <= self._max_j):
+            return self._exact_angles(p)
+
+        i, j = min(int(fx), self._max_i - 1), min(int(fy), self._max_j - 1)
+        tx, ty = fx - i, fy - j
+        row, next_row = self._angles[i], self._angles[i + 1]
+        return [
+            (a00 + (a01 - a00) * ty) * (1 - tx) + (a10 + (a11 - a10) * ty) * tx
+            for a00, a01, a10, a11 in zip(row[j], row[j + 1], next_row[j], next_row[j + 1])
+        ]
+
+    def goal_angle(self, p: Point) -> float:
+        """
+        Angular size of the empty goal from the point.
+        """
+        lower, upper = sorted(self.post_angles(p))
+        return upper - lower
+
+
 class Field:
     def __init__(self, x_min: float, x_max: float, y_min: float, y_max: float):
         assert x_min <= x_max and y_min <= y_max
@@ -217,6 +440,9 @@ class Field:
         self.x_max = x_max
         self.y_min = y_min
         self.y_max = y_max
+        # (x, y) bounds for the array kernels
+        self._lower = np.array([x_min, y_min])
+        self._upper = np.array([x_max, y_max])
 
         self.top_right_corner = Point(x_max, y_max)
         self.bottom_right_corner = Point(x_max, y_min)
@@ -241,8 +467,86 @@ class Field:
     def borders(self):
         return self.top_line, self.bottom_line, self.right_line, self.left_line
 
-    def border_distance(self, p: Point):
-        return min(
-            line.get_short_direction(p, infinity_line=True).length()
-            for line in self.borders
+    def contains(self, xy: np.ndarray) -> np.ndarray:
+        """
+        Point in self for (..., 2) array of points.
+        """
+        x, y = xy[..., 0], xy[..., 1]
+        return (
+            (self.x_max >= x) & (x >= self.x_min) & (self.y_max >= y) & (y >= self.y_min)
+        )
+
+    def border_distance(self, p: Union[Point, np.ndarray]):
+        """
+        Distance to the closest border line, a Point or (..., 2) array of points.
+        """
+        if isinstance(p, Point):
+            x, y = p.x, p.y
+            return min(
+                abs(self.y_max - y),
+                abs(self.y_min - y),
+                abs(self.x_max - x),
+                abs(self.x_min - x),
+            )
+
+        x, y = p[..., 0], p[..., 1]
+        return np.minimum(
+            np.minimum(np.abs(self.y_max - y), np.abs(self.y_min - y)),
+            np.minimum(np.abs(self.x_max - x), np.abs(self.x_min - x)),
         )
+
+    def slab_times(self, x, y, dx, dy):
+        """
+        Turns (enter, exit) when a point moving from (x, y) with the vector (dx, dy) is in the field,
+        starting from now. enter > exit if it never is.
+
+        The coordinates are floats or arrays which broadcast together.
+        A zero component of the vector doesn't limit the time.
+        """
+        if any(isinstance(v, np.ndarray) for v in (x, y, dx, dy)):
+            return self._slab_times_array(x, y, dx, dy)
+
+        if dx > 0:
+            tx0, tx1 = (self.x_min - x) / dx, (self.x_max - x) / dx
+        elif dx < 0:
+            tx0, tx1 = (self.x_max - x) / dx, (self.x_min - x) / dx
+        else:
+            tx0, tx1 = -np.inf, np.inf
+
+        if dy > 0:
+            ty0, ty1 = (self.y_min - y) / dy, (self.y_max - y) / dy
+        elif dy < 0:
+            ty0, ty1 = (self.y_max - y) / dy, (self.y_min - y) / dy
+        else:
+            ty0, ty1 = -np.inf, np.inf
+
+        return max(0, tx0, ty0), min(tx1, ty1)
+
+    def _slab_times_array(self, x, y, dx, dy):
+        x, y, dx, dy = np.broadcast_arrays(x, y, dx, dy)
+        return self.slab_times_2d(np.stack((x, y), axis=-1), np.stack((dx, dy), axis=-1))
+
+    def slab_times_2d(self, positions: np.ndarray, vectors: np.ndarray):
+        """
+        slab_times for (..., 2) arrays of positions and vectors which broadcast together,
+        e.g. one origin and (M, 2) vectors or (N, 2) origins and one vector.
+
+        Both axes are intersected at once, the result is a pair of (...) arrays.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t_lower = (self._lower - positions) / vectors
+            t_upper = (self._upper - positions) / vectors
+        still = vectors == 0
+        t0 = np.where(still, -np.inf, np.minimum(t_lower, t_upper))
+        t1 = np.where(still, np.inf, np.maximum(t_lower, t_upper))
+        return np.maximum(t0.max(axis=-1), 0), t1.min(axis=-1)
+
+    def exit_time(self, x, y, dx, dy):
+        """
+        Turns before a point moving with the vector leaves the field, np.nan if it is never inside,
+        np.inf if it never leaves.
+        """
+        enter, exit = self.slab_times(x, y, dx, dy)
+        if isinstance(enter, np.ndarray):
+            return np.where(enter <= exit, exit, np.nan)
+        return exit if enter <= exit else np.nan
@@ -1,6 +1,7 @@
 import numpy as np
-from copy import deepcopy
-from typing import List, Optional, Iterable
+from copy import copy
+from functools import lru_cache
+from typing import List, Optional, Iterable, Tuple
 from kaggle_environments.envs.football.helpers import Action, PlayerRole
 
 from .logger import logger
@@ -9,11 +10,96 @@ from .geometry import Point, Vector
 
 DEFAULT_TURNS_TO_FUTURE = 2
 
+# ball states are rounded to this number of decimals before caching
+HEIGHT_CACHE_DECIMALS = 6
+HEIGHT_CACHE_SIZE = 4096
+
+
+class Kinematics:
+    """
+    Immutable position and vector of a board object, derive new states with the with_* methods.
+    """
+
+    __slots__ = ("position", "vector")
+
+    def __init__(self, position: Point, vector: Vector):
+        _set_position(self, position)
+        _set_vector(self, vector)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    def __reduce__(self):
+        return self.__class__, (self.position, self.vector)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __repr__(self):
+        return f"Kinematics({self.position}->{self.vector})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Kinematics):
+            return NotImplemented
+        return self.position == other.position and self.vector == other.vector
+
+    def __hash__(self):
+        return hash((self.position, self.vector))
+
+    def with_position(self, position: Point) -> "Kinematics":
+        return Kinematics(position, self.vector)
+
+    def with_vector(self, vector: Vector) -> "Kinematics":
+        return Kinematics(self.position, vector)
+
+    def future_position(self, turns: int = DEFAULT_TURNS_TO_FUTURE) -> Point:
+        return self.position + self.vector * turns
+
+
+_set_position, _set_vector = Kinematics.position.__set__, Kinematics.vector.__set__
+
 
 class BoardObj:
+    """
+    An object on the board keeps its identity between the steps, its kinematic state is replaced.
+    """
+
     def __init__(self, position: Point, vector: Vector):
-        self.position = position
-        self.vector = vector
+        self.__dict__.update(position=position, vector=vector)
+
+    def __setattr__(self, name, value):
+        if name in ("position", "vector"):
+            raise AttributeError(f"Can't set {name}, replace the state.")
+        object.__setattr__(self, name, value)
+
+    @property
+    def state(self) -> Kinematics:
+        return Kinematics(self.position, self.vector)
+
+    @state.setter
+    def state(self, state: Kinematics):
+        # position and vector are plain attributes for fast reads, set together
+        self.__dict__.update(position=state.position, vector=state.vector)
+
+    def with_state(self, state: Kinematics):
+        """
+        Copy of the object in the new state, e.g. a prediction.
+        """
+        new_obj = copy(self)
+        new_obj.state = state
+        return new_obj
+
+    def with_position(self, position: Point):
+        return self.with_state(self.state.with_position(position))
+
+    def with_vector(self, vector: Vector):
+        return self.with_state(self.state.with_vector(vector))
 
     @property
     def x(self):
@@ -52,11 +138,28 @@ class Player(BoardObj):
         is_opponent: bool = False,
     ):
         super().__init__(position, vector)
-        self.id = id
-        self.role = role
-        self.tired_factor = tired_factor
-        self.yellow_card = yellow_card
-        self.is_opponent = is_opponent
+        self.__dict__.update(
+            id=id,
+            role=role,
+            tired_factor=tired_factor,
+            yellow_card=yellow_card,
+            is_opponent=is_opponent,
+        )
+
+    def update(
+        self,
+        position: Point,
+        vector: Vector,
+        tired_factor: float = 0,
+        yellow_card: bool = False,
+    ):
+        # one dict update instead of __setattr__ for every field, runs for every player every step
+        self.__dict__.update(
+            position=position,
+            vector=vector,
+            tired_factor=tired_factor,
+            yellow_card=yellow_card,
+        )
 
     def __repr__(self):
         return f"{self.role.name} {self.id} at {self.position}->{self.vector}"
@@ -64,16 +167,14 @@ class Player(BoardObj):
     def future_position(
         self, turns: int = DEFAULT_TURNS_TO_FUTURE, max_speed=False
     ) -> Point:
-        if max_speed and not self.vector.is_empty():
-            self.vector = self.vector * self.max_speed / self.vector.length()
-        return self.position + self.vector * turns
+        vector = self.vector
+        if max_speed and not vector.is_empty():
+            vector = vector * self.max_speed / vector.length()
+        return self.position + vector * turns
 
     def apply(self, stick: Action, speed: bool = False) -> "Player":
-        new_obj = deepcopy(self)
-
         if stick == Action.ReleaseDirection:
-            new_obj.vector = Vector(0, 0)
-            return new_obj
+            return self.with_vector(Vector(0, 0))
 
         acceleration = 0.006
         max_speed = self.max_speed * 0.95
@@ -90,8 +191,7 @@ class Player(BoardObj):
         if not speed:
             new_vector = new_vector.normalize() * self.walk_speed
 
-        new_obj.vector = new_vector
-        return new_obj
+        return self.with_vector(new_vector)
 
 
 class Ball(BoardObj):
@@ -107,11 +207,25 @@ class Ball(BoardObj):
         player: Optional[Player] = None,
     ):
         super().__init__(position, vector)
-        self.altitude = altitude
-        self.vertical_speed = vertical_speed
-        self.player = player
+        self.__dict__.update(
+            altitude=altitude, vertical_speed=vertical_speed, player=player
+        )
 
-        self._height_to_interval = {}
+    def update(
+        self,
+        position: Point,
+        vector: Vector,
+        altitude: float,
+        vertical_speed: float,
+        player: Optional[Player] = None,
+    ):
+        self.__dict__.update(
+            position=position,
+            vector=vector,
+            altitude=altitude,
+            vertical_speed=vertical_speed,
+            player=player,
+        )
 
     def __repr__(self):
         return f"Ball at Point(x={round(self.x, 2)}, y={round(self.y, 2)}, z={round(self.altitude, 2)})->{self.vector}"
@@ -125,20 +239,25 @@ class Ball(BoardObj):
             self.altitude + self.vertical_speed * turns - self.gravity * turns ** 2 / 2
         )
 
-    def height_interval(self, height):
-        if height in self._height_to_interval:
-            return self._height_to_interval[height]
+    def _height_key(self, height):
+        return (
+            round(float(self.altitude), HEIGHT_CACHE_DECIMALS),
+            round(float(self.vertical_speed), HEIGHT_CACHE_DECIMALS),
+            round(float(height), HEIGHT_CACHE_DECIMALS),
+            self.gravity,
+        )
 
-        d = self.vertical_speed ** 2 + 2 * self.gravity * (self.altitude - height)
-        if d < 0:
-            interval = Interval(0, np.inf)
-        else:
-            t1 = (self.vertical_speed - np.sqrt(d)) / self.gravity
-            t2 = (self.vertical_speed + np.sqrt(d)) / self.gravity
-            interval = Interval(-np.inf, t1) | Interval(t2, np.inf)
-            interval &= Interval(0, np.inf)
-        self._height_to_interval[height] = interval
-        return interval
+    def height_roots(self, height) -> Optional[Tuple[float, float]]:
+        """
+        Turns when future_altitude is equal to the height, None if the ball never reaches it.
+        """
+        return _height_roots(*self._height_key(height))
+
+    def height_interval(self, height) -> Interval:
+        """
+        Turns when the ball is not higher than the height.
+        """
+        return _height_interval(*self._height_key(height))
 
     def get_intercept_interval(
         self, board, player: Player, height: Optional[float] = None
@@ -161,6 +280,38 @@ class Ball(BoardObj):
         return height & speed & field
 
 
+@lru_cache(maxsize=HEIGHT_CACHE_SIZE)
+def _height_roots(altitude, vertical_speed, height, gravity):
+    d = vertical_speed ** 2 + 2 * gravity * (altitude - height)
+    if d < 0:
+        return None
+
+    t1 = (vertical_speed - np.sqrt(d)) / gravity
+    t2 = (vertical_speed + np.sqrt(d)) / gravity
+    return t1, t2
+
+
+@lru_cache(maxsize=HEIGHT_CACHE_SIZE)
+def _height_interval(altitude, vertical_speed, height, gravity):
+    roots = _height_roots(altitude, vertical_speed, height, gravity)
+    if roots is None:
+        return Interval(0, np.inf)
+
+    t1, t2 = roots
+    interval = Interval(-np.inf, t1) | Interval(t2, np.inf)
+    return interval & Interval(0, np.inf)
+
+
+def height_cache_info():
+    """
+    Hit and miss statistics of the process-wide height caches.
+    """
+    return {
+        "roots": _height_roots.cache_info(),
+        "interval": _height_interval.cache_info(),
+    }
+
+
 def speed_interval(
     position: Point,
     vector: Vector,
@@ -261,22 +412,397 @@ def __naive_speed_interval(position: Point, vector: Vector, opponent: Player):
         return Interval(0, np.inf) & Interval((-np.inf, t1), (t2, np.inf))
 
 
-def field_interval(position: Point, vector: Vector, board):
-    x, y = position.x, position.y
+def first_intercept_time(
+    position: Point,
+    vector: Vector,
+    players: [Player, Iterable[Player]],
+    acceleration: float = 0,
+) -> Tuple[float, Optional[Player]]:
+    """
+    The earliest time when one of the players can reach the object
+    moving from the position with the vector, and this player.
+    np.inf and None if nobody can.
+
+    Same time as speed_interval(...).lower(), without building the intervals.
+    """
+    if not isinstance(players, Iterable):
+        players = [players]
+
+    min_t, first_player = np.inf, None
+    for p in players:
+        t = __first_intercept_time(
+            position, vector, player=p, acceleration=acceleration, max_time=min_t
+        )
+        if t < min_t:
+            min_t, first_player = t, p
+
+    return min_t, first_player
+
+
+def __first_intercept_time(
+    position: Point,
+    vector: Vector,
+    player: Player,
+    acceleration: float = 0,
+    max_time: float = np.inf,
+):
+    if not acceleration:
+        return __naive_first_intercept_time(position, vector, player)
+
+    speed = vector.length()
+    player_speed = player.max_speed
+    pb = Vector.from_point(position - player.position)
+
+    if speed == 0:
+        return pb.length() / player_speed
+
+    direction = vector / speed
+    a = acceleration * direction
+
+    dx, dy = pb.x, pb.y
+    vx, vy = vector.x, vector.y
+    ax, ay = a.x, a.y
+
+    speed_2 = player_speed ** 2
+    for t in range(1, 101):
+        if t >= max_time:
+            break
+
+        x = dx + vx * t + ax * t ** 2 / 2
+        y = dy + vy * t + ay * t ** 2 / 2
+        if x ** 2 + y ** 2 <= speed_2 * t ** 2:
+            return t
+
+    return np.inf
+
+
+def __naive_first_intercept_time(position: Point, vector: Vector, player: Player):
+    speed = vector.length()
+    pb = Vector.from_point(position - player.position)
     dx, dy = vector.x, vector.y
 
-    if dx > 0:
-        tx = Interval((board.x_min - x) / dx, (board.x_max - x) / dx)
-    elif dx < 0:
-        tx = Interval((board.x_max - x) / dx, (board.x_min - x) / dx)
-    else:
-        tx = Interval(-np.inf, np.inf)
+    player_speed = player.max_speed
 
-    if dy > 0:
-        ty = Interval((board.y_min - y) / dy, (board.y_max - y) / dy)
-    elif dy < 0:
-        ty = Interval((board.y_max - y) / dy, (board.y_min - y) / dy)
-    else:
-        ty = Interval(-np.inf, np.inf)
+    # at^2 + 2bt + c <= 0
+    a = speed ** 2 - player_speed ** 2
+    b = dx * pb.x + dy * pb.y
+    c = pb.x ** 2 + pb.y ** 2
+
+    if a == 0:
+        if b == 0:
+            return 0 if c == 0 else np.inf
+        t = -c / (2 * b)
+        if b > 0:
+            return 0 if t >= 0 else np.inf
+        return max(t, 0)
+
+    d = b ** 2 - a * c
+    if d < 0:
+        return np.inf
 
-    return Interval(0, np.inf) & tx & ty
+    d = np.sqrt(d)
+    t1, t2 = sorted([(-b + d) / a, (-b - d) / a])
+
+    if speed >= player_speed:
+        # between the roots
+        t = max(0, t1)
+        return t if t <= t2 else np.inf
+
+    # outside of the roots
+    return 0 if t1 >= 0 else max(0, t2)
+
+
+def first_intercept_times(
+    positions: np.ndarray,
+    vectors: np.ndarray,
+    players: [Player, List[Player]],
+    acceleration: float = 0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    first_intercept_time for many objects, positions and vectors are (M, 2) or (2,) arrays.
+
+    Returns (M,) array of times and (M,) array of indices of the first players, -1 if nobody can.
+    """
+    if not isinstance(players, Iterable):
+        players = [players]
+    players = list(players)
+
+    positions, vectors = np.broadcast_arrays(
+        np.atleast_2d(np.asarray(positions, dtype=float)),
+        np.atleast_2d(np.asarray(vectors, dtype=float)),
+    )
+    num = len(vectors)
+    if not players:
+        return np.full(num, np.inf), np.full(num, -1)
+
+    player_positions = np.array([[p.x, p.y] for p in players])
+    player_speeds = np.array([p.max_speed for p in players])
+
+    # (M, P)
+    pbx = positions[:, 0, None] - player_positions[None, :, 0]
+    pby = positions[:, 1, None] - player_positions[None, :, 1]
+    vx, vy = vectors[:, 0, None], vectors[:, 1, None]
+    speed = np.sqrt(vx ** 2 + vy ** 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if acceleration:
+            times = _windage_first_intercept_times(
+                pbx, pby, vx, vy, speed, player_speeds, acceleration
+            )
+        else:
+            times = _naive_first_intercept_times(pbx, pby, vx, vy, speed, player_speeds)
+
+    indices = np.argmin(times, axis=1)
+    min_times = times[np.arange(num), indices]
+    indices = np.where(np.isfinite(min_times), indices, -1)
+    return min_times, indices
+
+
+def _naive_first_intercept_times(pbx, pby, vx, vy, speed, player_speeds):
+    a = speed ** 2 - player_speeds ** 2
+    b = vx * pbx + vy * pby
+    c = pbx ** 2 + pby ** 2
+
+    # a == 0
+    t = -c / (2 * b)
+    linear = np.where(
+        b == 0,
+        np.where(c == 0, 0, np.inf),
+        np.where(b > 0, np.where(t >= 0, 0, np.inf), np.maximum(t, 0)),
+    )
+
+    d = b ** 2 - a * c
+    d_root = np.sqrt(d)
+    r1, r2 = (-b + d_root) / a, (-b - d_root) / a
+    t1, t2 = np.minimum(r1, r2), np.maximum(r1, r2)
+
+    between = np.maximum(t1, 0)
+    between = np.where(between <= t2, between, np.inf)
+    outside = np.where(t1 >= 0, 0, np.maximum(t2, 0))
+    quadratic = np.where(speed >= player_speeds, between, outside)
+    quadratic = np.where(d < 0, np.inf, quadratic)
+
+    return np.where(a == 0, linear, quadratic)
+
+
+def _windage_reached(pbx, pby, vx, vy, speed, player_speeds, acceleration):
+    """
+    (..., T) mask of the turns 1..100 when the player can be at the object, as in __speed_interval.
+    """
+    vx, vy = np.asarray(vx), np.asarray(vy)
+    ax = acceleration * (vx / speed)
+    ay = acceleration * (vy / speed)
+
+    t = np.arange(1, 101, dtype=float)
+    x = pbx[..., None] + vx[..., None] * t + ax[..., None] * t ** 2 / 2
+    y = pby[..., None] + vy[..., None] * t + ay[..., None] * t ** 2 / 2
+    return x ** 2 + y ** 2 <= (player_speeds ** 2)[..., None] * t ** 2
+
+
+def _windage_first_intercept_times(pbx, pby, vx, vy, speed, player_speeds, acceleration):
+    # (M, P, T)
+    reached = _windage_reached(
+        pbx, pby, vx, vy, speed, player_speeds[None, :], acceleration
+    )
+
+    times = np.where(reached.any(axis=-1), np.argmax(reached, axis=-1) + 1, np.inf)
+    standing = np.sqrt(pbx ** 2 + pby ** 2) / player_speeds
+    return np.where(speed == 0, standing, times)
+
+
+# relative slack of the lower bounds of BallRace against rounding errors of the exact solution
+INTERCEPT_BOUND_SLACK = 1e-6
+
+
+class BallRace:
+    """
+    Intercept intervals of the ball for the players of both teams,
+    the same as Ball.get_intercept_interval with the player's height,
+    computed on the shared trajectory of the ball.
+
+    The exact intervals are solved on demand, several players in one call.
+    Every player has a cheap lower bound of the time, so first() solves only
+    the players who can still win.
+
+    The decisions use the rows of the controlled player and the opponents;
+    the teammates' times are informational only, they are logged by
+    without_ball_action and don't change the play.
+    """
+
+    def __init__(self, board):
+        ball = board.ball
+        self.ball = ball
+        self.players: List[Player] = list(board.my_team.values()) + list(
+            board.opponent_team.values()
+        )
+        self._index = {(p.is_opponent, p.id): i for i, p in enumerate(self.players)}
+
+        self._pbx = np.array([ball.position.x - p.x for p in self.players])
+        self._pby = np.array([ball.position.y - p.y for p in self.players])
+        self._player_speeds = np.array([p.max_speed for p in self.players])
+        self._speed = ball.vector.length()
+        if self._speed:
+            # terms of the ball's path in turns 1..100 shared by all players, see _windage_reached
+            vx, vy = ball.vector.x, ball.vector.y
+            t = np.arange(1, 101, dtype=float)
+            self._path_x = vx * t, ball.windage * (vx / self._speed) * t ** 2 / 2
+            self._path_y = vy * t, ball.windage * (vy / self._speed) * t ** 2 / 2
+            self._reach_sq = (self._player_speeds ** 2)[:, None] * t ** 2
+
+        field = field_interval(ball.position, ball.vector, board=board)
+        self._height_field = {}  # height -> Interval, the players have a few heights
+        for p in self.players:
+            if p.height not in self._height_field:
+                self._height_field[p.height] = ball.height_interval(p.height) & field
+
+        self._intervals: List[Optional[Interval]] = [None] * len(self.players)
+        self._times: List[Optional[float]] = [None] * len(self.players)
+        self.solved = 0  # players with the exact interval
+
+    def __repr__(self):
+        player, t = self.first()
+        return f"BallRace(first={player}, time={t})"
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """
+        Lower bounds of the players' times.
+
+        The ball moves along the line of its vector, so the player can't reach it
+        faster than the distance to the line divided by his max speed.
+        """
+        if self._speed == 0:
+            distance = np.sqrt(self._pbx ** 2 + self._pby ** 2)
+        else:
+            vector = self.ball.vector
+            distance = np.abs(self._pbx * vector.y - self._pby * vector.x) / self._speed
+        return distance / self._player_speeds * (1 - INTERCEPT_BOUND_SLACK)
+
+    def _solve(self, indices: List[int]):
+        indices = [i for i in indices if self._intervals[i] is None]
+        if not indices:
+            return
+
+        if self._speed == 0:
+            standing = (
+                np.sqrt(self._pbx[indices] ** 2 + self._pby[indices] ** 2)
+                / self._player_speeds[indices]
+            )
+            speed_intervals = [Interval(t, np.inf) for t in standing]
+        else:
+            (vxt, axt), (vyt, ayt) = self._path_x, self._path_y
+            rows = np.array(indices)
+            x = self._pbx[rows, None] + vxt + axt
+            y = self._pby[rows, None] + vyt + ayt
+            reached = x ** 2 + y ** 2 <= self._reach_sq[rows]
+
+            # the rows padded with unreached turns in one flat array, every run
+            # is a pair of changes inside its row, turn of the column c is c + 1
+            width = reached.shape[1] + 2
+            padded = np.zeros((len(indices), width), dtype=bool)
+            padded[:, 1:-1] = reached
+            flat = padded.ravel()
+            changes = np.flatnonzero(flat[1:] != flat[:-1]).tolist()
+            runs = [[] for _ in indices]
+            for s, e in zip(changes[::2], changes[1::2]):
+                runs[s // width].append((s % width + 1, e % width))
+            speed_intervals = [Interval(*r) for r in runs]
+
+        for i, speed_interval in zip(indices, speed_intervals):
+            interval = self._height_field[self.players[i].height] & speed_interval
+            self._intervals[i] = interval
+            self._times[i] = interval.lower() if interval else np.inf
+        self.solved += len(indices)
+
+    @property
+    def intervals(self) -> List[Interval]:
+        self._solve(range(len(self.players)))
+        return self._intervals
+
+    @property
+    def times(self) -> List[float]:
+        self._solve(range(len(self.players)))
+        return self._times
+
+    def _i(self, player: Player) -> int:
+        i = self._index[(player.is_opponent, player.id)]
+        self._solve([i])
+        return i
+
+    def interval(self, player: Player) -> Interval:
+        return self._intervals[self._i(player)]
+
+    def time(self, player: Player) -> float:
+        """
+        The earliest turn when the player can reach the ball, np.inf if he can't.
+        """
+        return self._times[self._i(player)]
+
+    def position(self, player: Player) -> Optional[Point]:
+        """
+        Where the player reaches the ball first, None if he can't.
+        """
+        t = self.time(player)
+        if not np.isfinite(t):
+            return None
+        return self.ball.future_position(t)
+
+    def height_interval(self, player: Player) -> Interval:
+        """
+        Turns when the ball is low enough for the player.
+        """
+        return self.ball.height_interval(player.height)
+
+    def first(self, opponent: Optional[bool] = None) -> Tuple[Optional[Player], float]:
+        """
+        The first player at the ball and his time, only of one team if opponent is set.
+        The first player of the team wins among equal times, (None, np.inf) if nobody can reach the ball.
+
+        The player with the lowest bound is solved first, then all players whose bound
+        doesn't exceed his time, the rest can't be faster.
+        """
+        candidates = [
+            i
+            for i, p in enumerate(self.players)
+            if opponent is None or p.is_opponent == opponent
+        ]
+        if not candidates:
+            return None, np.inf
+
+        bounds = self.bounds[candidates]
+        order = [candidates[k] for k in np.argsort(bounds, kind="stable")]
+        best = min(
+            (self._times[i] for i in candidates if self._times[i] is not None),
+            default=np.inf,
+        )
+        if not np.isfinite(best):
+            self._solve(order[:1])
+            best = self._times[order[0]]
+        self._solve([i for i, b in zip(candidates, bounds) if b <= best])
+
+        first_player, min_t = None, np.inf
+        for i in candidates:
+            t = self._times[i]
+            if t is not None and t < min_t:
+                first_player, min_t = self.players[i], t
+        return first_player, min_t
+
+
+def field_times(
+    positions: np.ndarray, vectors: np.ndarray, board
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    field_interval for many objects in one call, positions and vectors are (M, 2) or (2,) arrays,
+    e.g. one origin and M vectors.
+
+    Returns (M,) arrays of enter and exit turns, enter > exit if the object is never in the field.
+    """
+    enter, exit = board.field.slab_times_2d(
+        np.asarray(positions, dtype=float), np.asarray(vectors, dtype=float)
+    )
+    return np.atleast_1d(enter), np.atleast_1d(exit)
+
+
+def field_interval(position: Point, vector: Vector, board):
+    enter, exit = board.field.slab_times(position.x, position.y, vector.x, vector.y)
+    return Interval(enter, exit)
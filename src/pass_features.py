@@ -0,0 +1,260 @@
+import numpy as np
+from typing import Dict
+from kaggle_environments.envs.football.helpers import Action, PlayerRole
+
+from .board import Board
+from .models import Player
+from .geometry import segment_distances
+
+
+def _future(positions, vectors, turns):
+    return positions + vectors * turns
+
+
+def _length(x, y):
+    return np.sqrt(x ** 2 + y ** 2)
+
+
+def _angle(x, y):
+    """
+    Vector.angle(grade=True) for arrays of coordinates.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d = np.where(x == 0, y * np.inf, y / np.where(x == 0, 1, x))
+    a = np.arctan(d)
+    a = np.where(x < 0, np.where(y >= 0, np.pi + a, a - np.pi), a)
+    a = a * (180 / np.pi)
+    return np.where((x == 0) & (y == 0), np.nan, a)
+
+
+def _angle_between(x1, y1, x2, y2):
+    """
+    angle_between_vectors(grade=True) for arrays of coordinates.
+    """
+    n1 = _length(x1, y1)
+    n2 = _length(x2, y2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s = (x1 / n1) * (x2 / n2) + (y1 / n1) * (y2 / n2)
+    s = np.where(np.abs(s) > 1, np.sign(s), s)
+    a = np.arccos(s) * (180 / np.pi)
+    return np.where((n1 == 0) | (n2 == 0), np.nan, a)
+
+
+class PassFeatures:
+    """
+    Pass features of all teammates of the player, computed with array operations.
+
+    The eligibility of every pass type matches Target.can_high_pass, Target.can_long_pass
+    and Target.can_short_pass of the same target.
+    """
+
+    def __init__(self, board: Board, player: Player):
+        self.board = board
+        self.player = player
+
+        team = list(board.my_team.values())
+        self.ids = np.array([p.id for p in team])
+        self._index = {id: i for i, id in enumerate(self.ids)}
+
+        positions = np.array([[p.x, p.y] for p in team])
+        vectors = np.array([[p.vector.x, p.vector.y] for p in team])
+        is_gk = np.array([p.role == PlayerRole.GoalKeeper for p in team])
+        is_player = np.array([p is board.controlled_player for p in team])
+
+        opponents = list(board.opponent_team.values())
+        o_positions = np.array([[p.x, p.y] for p in opponents])
+        o_vectors = np.array([[p.vector.x, p.vector.y] for p in opponents])
+        o_gk = np.array([p.role == PlayerRole.GoalKeeper for p in opponents])
+
+        self._positions, self._vectors = positions, vectors
+        self._o_positions, self._o_vectors, self._o_gk = o_positions, o_vectors, o_gk
+
+        player_position = np.array([player.x, player.y])
+        player_vector = np.array([player.vector.x, player.vector.y])
+
+        f = {}
+
+        vector_to_target = _future(positions, vectors, 5) - _future(
+            player_position, player_vector, 5
+        )
+        f["pass_distance"] = _length(vector_to_target[:, 0], vector_to_target[:, 1])
+        f["pass_angle"] = _angle(vector_to_target[:, 0], vector_to_target[:, 1])
+        f["diversion_angle"] = np.abs(
+            _angle_between(
+                vector_to_target[:, 0],
+                vector_to_target[:, 1],
+                player_vector[0],
+                player_vector[1],
+            )
+        )
+
+        self._offside_lines = {turns: self._offside_line(turns) for turns in (0, 5, 7)}
+        f["is_offside_position"] = ~is_player & (
+            (positions[:, 0] > self._offside_lines[0])
+            | (_future(positions, vectors, 7)[:, 0] > self._offside_lines[7])
+        )
+        f["is_gk"] = is_gk
+
+        goal = board.opponent_goal_position
+        p = _future(positions, vectors, 5)
+        f["goal_distance"] = _length(goal.x - p[:, 0], goal.y - p[:, 1])
+
+        my_goal = board.my_goal_position
+        f["my_goal_distance"] = _length(
+            my_goal.x - positions[:, 0], my_goal.y - positions[:, 1]
+        )
+
+        f["opponents_around_0_15"] = self._num_opponents_around(0.15, turns=0)
+        f["opponents_around_0_05"] = self._num_opponents_around(0.05, turns=0)
+        f["opponents_around_5_25"] = self._num_opponents_around(0.25, turns=5)
+        f["opponents_ahead_0_45"] = self._num_opponents_ahead(45, turns=0)
+        f["opponents_ahead_5_45"] = self._num_opponents_ahead(45, turns=5)
+
+        lane_distance = self._lane_distance(player_position)
+        f["free_line_0_10"] = ~np.any(lane_distance < 0.1, axis=1)
+        f["free_line_0_05"] = ~np.any(lane_distance < 0.05, axis=1)
+
+        self.features: Dict[str, np.ndarray] = f
+        self.eligible: Dict[Action, np.ndarray] = {
+            Action.HighPass: self._can_high_pass(),
+            Action.LongPass: self._can_long_pass(),
+            Action.ShortPass: self._can_short_pass(),
+        }
+
+    def __repr__(self):
+        return f"PassFeatures({self.player.role.name} {self.player.id}, ids={list(self.ids)})"
+
+    def can_pass(self, action: Action, target: Player) -> bool:
+        return bool(self.eligible[action][self._index[target.id]])
+
+    def _offside_line(self, turns):
+        """
+        Board.offside_line
+        """
+        mask = ~self._o_gk
+        x = _future(self._o_positions[mask], self._o_vectors[mask], turns)[:, 0]
+        return max(x.max(), 0, self.board.ball.position.x)
+
+    def _relative_opponents(self, turns):
+        targets = _future(self._positions, self._vectors, turns)
+        mask = ~self._o_gk
+        opponents = _future(self._o_positions[mask], self._o_vectors[mask], turns)
+        v = opponents[None, :, :] - targets[:, None, :]
+        return targets, v[..., 0], v[..., 1]
+
+    def _num_opponents_around(self, max_distance, turns=0):
+        _, x, y = self._relative_opponents(turns)
+        return np.sum(_length(x, y) < max_distance, axis=1)
+
+    def _num_opponents_ahead(self, max_angle, turns=0):
+        targets, x, y = self._relative_opponents(turns)
+        goal = self.board.opponent_goal_position
+        goal_x = goal.x - targets[:, 0]
+        goal_y = goal.y - targets[:, 1]
+        target_distance = _length(goal_x, goal_y)
+        target_angle = _angle(goal_x - 0.15, goal_y - 0)
+        # see Target.num_opponents_ahead, the interval is only extended to the positive side
+        upper = np.where(target_angle > max_angle, target_angle, max_angle)
+
+        angle = _angle(x, y)
+        ahead = (
+            (-max_angle <= angle)
+            & (angle <= upper[:, None])
+            & (_length(x, y) < target_distance[:, None])
+        )
+        return np.sum(ahead, axis=1)
+
+    def _lane_distance(self, player_position):
+        """
+        Distances from opponents to the pass lines, see Target.__is_free_line.
+        """
+        points = self._o_positions
+
+        # opponents close to the player don't block the pass
+        d = points - player_position
+        points = points[_length(d[:, 0], d[:, 1]) >= 0.07]
+
+        return segment_distances(
+            player_position,
+            self._positions[:, None, :],
+            points[None, :, :],
+            include_start=False,
+            include_end=False,
+        )
+
+    def _can_high_pass(self):
+        f = self.features
+        board = self.board
+        player = self.player
+
+        allowed = (
+            ~f["is_offside_position"] & ~f["is_gk"] & ~(f["my_goal_distance"] < 0.4)
+        )
+
+        player_goal_vector = board.opponent_goal_position - player.future_position(5)
+        forward = (
+            (f["diversion_angle"] < 120)
+            & (0.4 < f["pass_distance"])
+            & (f["pass_distance"] < 1.3)
+            & (_length(player_goal_vector.x, player_goal_vector.y) > 0.4)
+        )
+        forward &= (
+            (f["opponents_ahead_0_45"] < 2) & (np.abs(f["pass_angle"]) < 45)
+        ) | (f["opponents_around_5_25"] < 1)
+
+        cross = (
+            (f["diversion_angle"] < 90)
+            & (player.x > board.x_max - 0.3)
+            & (self._positions[:, 0] < self._offside_lines[5] - 0.07)
+            & (f["goal_distance"] < 0.2)
+            & (abs(player.y) > board.y_max - 0.2)
+        )
+        return allowed & (forward | cross)
+
+    def _can_long_pass(self):
+        f = self.features
+        board = self.board
+        player = self.player
+
+        allowed = ~f["is_offside_position"] & ~f["is_gk"]
+
+        forward = (
+            (f["diversion_angle"] < 120)
+            & (self._positions[:, 0] > 0)
+            & (0.2 < f["pass_distance"])
+            & (f["pass_distance"] < 0.4)
+            & (self._vectors[:, 0] > 0)
+            & (f["opponents_ahead_5_45"] == 0)
+            & (np.abs(f["pass_angle"]) < 45)
+        )
+
+        cross = (
+            (f["diversion_angle"] < 90)
+            & (player.x > board.x_max - 0.3)
+            & (self._positions[:, 0] < self._offside_lines[5] - 0.05)
+            & (f["goal_distance"] < 0.2)
+            & (board.y_max - 0.2 > abs(player.y) > board.y_max - 0.4)
+        )
+        return allowed & (forward | cross)
+
+    def _can_short_pass(self):
+        f = self.features
+
+        allowed = ~f["is_offside_position"] & ~(f["is_gk"] & (np.abs(f["pass_angle"]) > 135))
+
+        far = (
+            (f["goal_distance"] > 0.2)
+            & (f["diversion_angle"] < 120)
+            & (0.1 < f["pass_distance"])
+            & (f["pass_distance"] < 0.4)
+            & (f["opponents_around_0_15"] == 0)
+            & f["free_line_0_10"]
+        )
+        close = (
+            (f["goal_distance"] <= 0.3)
+            & (0.05 < f["pass_distance"])
+            & (f["pass_distance"] < 0.35)
+            & (f["opponents_around_0_05"] == 0)
+            & f["free_line_0_05"]
+        )
+        return allowed & (far | close)
@@ -1,13 +1,21 @@
+from collections import Counter
 from kaggle_environments.envs.football.helpers import PlayerRole
 
 from .board import Board
-from .models import Player, field_interval, speed_interval
+from .models import Player, field_interval, first_intercept_time
 from .logger import logger
 from .portion import Interval
 from .geometry import *
+from .pass_features import PassFeatures
 
 SHOT_TH = 0.3
 
+# covers the rounding of the score terms, Target.score_bound is never below the score
+SCORE_BOUND_SLACK = 1e-9
+
+# candidates pruned by every stage of make_pass, accumulated over the game
+PASS_PRUNING = Counter()
+
 
 class Target:
     def __init__(self, board: Board, player: Player, target: Player):
@@ -16,6 +24,7 @@ class Target:
         self.target = target
 
         self.__opponents = {}  # turns -> list of dict
+        self.__occupancy = {}  # (turns, block_distance, body_radius) -> AngularOccupancy
 
         self.vector_to_target = Vector.from_point(
             self.target.future_position(turns=5) - self.player.future_position(turns=5)
@@ -27,10 +36,11 @@ class Target:
         self.pass_direction = self.vector_to_target.to_direction()
         self.pass_angle = self.vector_to_target.angle(grade=True)
         self.is_offside_position = self.__is_offside_position()
-        self.goal_probability = self.__get_goal_probability(turns=5)
-        self.intercept_time, self.field_time = self.__get_intercept_time()
 
-        self.score = self.__get_score()
+        # the scoring is computed on first access, make_pass skips it for the pruned targets
+        self._goal_probability = None
+        self._intercept_times = None
+        self._score = None
 
     def __repr__(self):
         return (
@@ -40,17 +50,10 @@ class Target:
         )
 
     def __is_out(self):
-        if (
-            self.board.is_out(self.target.future_position(0))
-            or self.board.distance_from_out(self.target.future_position(0)) < 0.05
-        ):
-            return True
-
-        if (
-            self.board.is_out(self.target.future_position(5))
-            or self.board.distance_from_out(self.target.future_position(5)) < 0.05
-        ):
-            return True
+        for turns in (0, 5):
+            p = self.target.future_position(turns)
+            if self.board.is_out(p) or self.board.distance_from_out(p) < 0.05:
+                return True
 
         return False
 
@@ -72,10 +75,7 @@ class Target:
             for x in self.board.opponent_team.values()
             if x.role != PlayerRole.GoalKeeper
         )
-        interval = speed_interval(self.position, new_vector, opponent=opponent_team)
-        intercept_time = np.inf
-        if interval:
-            intercept_time = interval.lower()
+        intercept_time, _ = first_intercept_time(self.position, new_vector, opponent_team)
 
         return intercept_time, field_time
 
@@ -127,6 +127,73 @@ class Target:
 
         return score
 
+    @property
+    def goal_probability(self) -> float:
+        if self._goal_probability is None:
+            self._goal_probability = self.__get_goal_probability(turns=5)
+        return self._goal_probability
+
+    @property
+    def intercept_time(self) -> float:
+        if self._intercept_times is None:
+            self._intercept_times = self.__get_intercept_time()
+        return self._intercept_times[0]
+
+    @property
+    def field_time(self) -> float:
+        if self._intercept_times is None:
+            self._intercept_times = self.__get_intercept_time()
+        return self._intercept_times[1]
+
+    @property
+    def score(self) -> float:
+        if self._score is None:
+            self._score = self.__get_score()
+        return self._score
+
+    def score_bound(self, defence_x: float) -> float:
+        """
+        Upper bound of the score, the opponent-dependent terms are taken at their best
+        and the goal probability is bounded by the empty goal.
+
+        defence_x is the max x of the opponents, except the goalkeeper, in 5 turns.
+        """
+        if self.is_offside_position:
+            return -1
+
+        bound = 1
+        if self.player.role == PlayerRole.GoalKeeper:
+            bound -= 0.1
+        if self.vector.x < 0:
+            bound -= 0.2
+
+        # free field and a wide free angle
+        bound += 0.15 + 0.15
+        if self.target.future_position(turns=5).x > defence_x:
+            bound += 0.2
+
+        if bound > 0:
+            bound *= 1 + self.goal_probability_bound(turns=5)
+
+        return bound + SCORE_BOUND_SLACK
+
+    def goal_probability_bound(self, turns=5):
+        """
+        Upper bound of the goal probability: the goal isn't blocked by the opponents,
+        the player's vector points at the goal.
+        """
+        board = self.board
+        if self.x > board.x_max or self.x < 0:
+            return 0
+
+        lower, upper = board.goal_visibility.post_angles(
+            self.target.future_position(turns=turns)
+        )
+        p = min(1, max(upper - lower, 0) / 90)
+        if self.goal_vector(turns=turns).length() < 0.3:
+            p *= 3
+        return p
+
     @property
     def position(self):
         return self.target.position
@@ -220,31 +287,34 @@ class Target:
             if x["angle"] in interval and x["distance"] < target_distance
         )
 
+    def angular_occupancy(
+        self, turns=0, block_distance=0.05, body_radius=0.012
+    ) -> AngularOccupancy:
+        """
+        Directions from the target to the opponents closer than block_distance.
+        """
+        key = (turns, block_distance, body_radius)
+        if key not in self.__occupancy:
+            opponents = [
+                p
+                for p in self.__get_opponents(turns, with_gk=False)
+                if p["distance"] < block_distance
+            ]
+            angles = [p["angle"] for p in opponents]
+            half_sizes = 0
+            if body_radius:
+                distances = np.array([p["distance"] for p in opponents])
+                half_sizes = np.arctan(body_radius / distances) * 180 / np.pi
+            self.__occupancy[key] = AngularOccupancy(angles, half_sizes)
+        return self.__occupancy[key]
+
     def blocked_directions(self, turns=0, block_distance=0.05):
-        d = set()
-        for p in self.__get_opponents(turns, with_gk=False):
-            if p["distance"] < block_distance:
-                d.add(angle_to_direction(p["angle"], grade=True))
-        return d
+        return self.angular_occupancy(
+            turns, block_distance, body_radius=0
+        ).blocked_directions()
 
     def blocked_interval(self, turns=0, block_distance=0.05):
-        d = Interval()
-        for p in self.__get_opponents(turns, with_gk=False):
-            angle = p["angle"]
-            distance = p["distance"]
-            if distance < block_distance:
-                angular_half_size = np.arctan(0.012 / distance) * 180 / np.pi
-                i = Interval(
-                    round(angle - angular_half_size), round(angle + angular_half_size)
-                )
-                if not i:
-                    continue
-                if i.upper() > 180:
-                    i = Interval((i.lower(), 180), (i.upper() - 360, -180))
-                if i.lower() < -180:
-                    i = Interval((-180, i.upper()), (i.lower() + 360, 180))
-                d |= i
-        return d
+        return self.angular_occupancy(turns, block_distance).to_interval()
 
     def can_high_pass(self, turns=5) -> bool:
         if (
@@ -303,18 +373,24 @@ class Target:
         return False
 
     def __is_free_line(self, turns=0, max_distance=0.05):
-        line = Line(
-            self.player.future_position(turns), self.target.future_position(turns)
+        board = self.board
+        ids = list(board.opponent_team)
+        positions = board.opponent_positions[ids]
+
+        # opponents close to the player don't block the pass
+        d = positions - (self.player.x, self.player.y)
+        mask = np.sqrt(d[:, 0] ** 2 + d[:, 1] ** 2) >= 0.07
+
+        start = self.player.future_position(turns)
+        end = self.target.future_position(turns)
+        distances = segment_distances(
+            (start.x, start.y),
+            (end.x, end.y),
+            positions[mask] + board.opponent_vectors[ids][mask] * turns,
+            include_start=False,
+            include_end=False,
         )
-        for opponent in self.board.opponent_team.values():
-            if euclidean_distance(opponent.position, self.player.position) < 0.07:
-                continue
-            intercept_vector = line.get_short_direction(
-                opponent.future_position(turns), include_start=False, include_end=False
-            )
-            if intercept_vector and intercept_vector.length() < max_distance:
-                return False
-        return True
+        return not np.any(distances < max_distance)
 
     def can_short_pass(self):
         if self.is_offside_position:
@@ -349,8 +425,7 @@ class Target:
 
         position = self.target.future_position(turns=turns)
 
-        post_vectors = [Vector.from_point(p - position) for p in board.opponent_posts]
-        interval = Interval(*[x.angle(grade=True) for x in post_vectors])
+        interval = Interval(*board.goal_visibility.post_angles(position))
 
         for p in self.__get_opponents(turns=turns, with_gk=True):
             angle = p["angle"]
@@ -405,8 +480,7 @@ class Target:
 
         position = self.target.future_position(turns=turns)
 
-        post_vectors = [Vector.from_point(p - position) for p in board.opponent_posts]
-        interval = Interval(*[x.angle(grade=True) for x in post_vectors])
+        interval = Interval(*board.goal_visibility.post_angles(position))
 
         for p in self.__get_opponents(turns=turns, with_gk=True):
             if not p["gk"]:
@@ -419,7 +493,7 @@ class Target:
         return False
 
 
-def make_pass(board: Board, player: Player, speed=True):
+def make_pass(board: Board, player: Player, speed=True, pass_features=None):
     if board.command_count < 2:
         return
 
@@ -454,23 +528,11 @@ def make_pass(board: Board, player: Player, speed=True):
         if p != player:
             targets.append(Target(board=board, player=player, target=p))
 
-    pass_targets = []
-    action_to_attribute = {
-        Action.HighPass: "can_high_pass",
-        Action.LongPass: "can_long_pass",
-        Action.ShortPass: "can_short_pass",
-    }
-    for x in targets:
-        if x.score < current_score * 1.1 or x.pass_direction in blocked_directions:
-            continue
-
-        for action in (Action.HighPass, Action.LongPass, Action.ShortPass):
-            if x.__getattribute__(action_to_attribute[action])():
-                pass_targets.append((action, x))
-
-    if pass_targets:
-        logger.debug(f"Pass targeting: targets: {pass_targets}.")
-        action, target = sorted(pass_targets, key=lambda t: -t[1].score)[0]
+    best = __find_best_pass(
+        board, player, targets, current_score, blocked_directions, pass_features
+    )
+    if best:
+        action, target = best
         if action == Action.HighPass:
             if target.pass_distance > 0.6:
                 power = 5
@@ -499,7 +561,102 @@ def make_pass(board: Board, player: Player, speed=True):
         return a
 
 
+def __find_best_pass(
+    board, player, targets, current_score, blocked_directions, pass_features=None
+):
+    """
+    The pass to the target with the best score, the first one in targets among equal scores.
+
+    Stages: the blocked directions, the score bounds and the pass eligibility prune the targets,
+    the rest are scored in the order of their bounds until no bound can beat the best pass.
+    """
+    threshold = current_score * 1.1
+    defence_x = max(
+        p.future_position(turns=5).x
+        for p in board.opponent_team.values()
+        if p.role != PlayerRole.GoalKeeper
+    )
+
+    pruned = Counter()
+    candidates = []
+    for i, x in enumerate(targets):
+        if x.pass_direction in blocked_directions:
+            pruned["blocked"] += 1
+            continue
+
+        bound = x.score_bound(defence_x)
+        if bound < threshold:
+            pruned["bound"] += 1
+            continue
+
+        candidates.append((bound, i, x))
+
+    eligible = []
+    if candidates:
+        # all teammates at once, cheaper than scoring the targets which can't get the pass
+        if pass_features is None:
+            pass_features = PassFeatures(board, player)
+        for bound, i, x in candidates:
+            action = next(
+                (
+                    a
+                    for a in (Action.HighPass, Action.LongPass, Action.ShortPass)
+                    if pass_features.can_pass(a, x.target)
+                ),
+                None,
+            )
+            if action is None:
+                pruned["eligibility"] += 1
+            else:
+                eligible.append((bound, i, action, x))
+    eligible.sort(key=lambda c: (-c[0], c[1]))
+
+    best = None  # score, index, action, target
+    for n, (bound, i, action, x) in enumerate(eligible):
+        if best and bound < best[0]:
+            pruned["early_exit"] += len(eligible) - n
+            break
+
+        if x.score < threshold:
+            pruned["score"] += 1
+            continue
+
+        if best is None or x.score > best[0] or (x.score == best[0] and i < best[1]):
+            best = (x.score, i, action, x)
+
+    PASS_PRUNING.update(pruned)
+    logger.debug(
+        f"Pass targeting: best = {best[2:] if best else None}, "
+        f"candidates = {len(targets)}, pruned = {dict(pruned)}."
+    )
+    return best[2:] if best else None
+
+
 def make_shot(board: Board, player: Player, speed=True):
+    shot = __find_shot(board, player, goal_score=lambda current: current.goal_probability)
+    if shot:
+        vector, kwargs = shot
+        return board.set_action(Action.Shot, vector, sprint=speed, **kwargs)
+
+
+def may_shoot(board: Board, player: Player) -> bool:
+    """
+    False if make_shot surely doesn't shoot, the goal probability is taken at its bound.
+    """
+    shot = __find_shot(
+        board,
+        player,
+        goal_score=lambda current: current.goal_probability_bound(turns=5) + SCORE_BOUND_SLACK,
+    )
+    return shot is not None
+
+
+def __find_shot(board, player, goal_score):
+    """
+    The shot vector and the set_action arguments, None if the player shouldn't shoot.
+
+    goal_score maps the Target of the player to its goal probability, or to an upper bound of it.
+    """
     if board.command_count < 1:
         return
 
@@ -508,7 +665,7 @@ def make_shot(board: Board, player: Player, speed=True):
     goal_vector = current.goal_vector(turns=5)
     goal_distance = goal_vector.length()
 
-    goal_score = current.goal_probability
+    goal_score = goal_score(current)
 
     logger.debug(
         f"Make shot: position = {player.position}, goal_distance = {round(goal_distance, 2)}, "
@@ -516,7 +673,7 @@ def make_shot(board: Board, player: Player, speed=True):
     )
 
     if goal_score > SHOT_TH or goal_distance < 0.15:
-        return board.set_action(Action.Shot, goal_vector, sprint=speed)
+        return goal_vector, {}
 
     if goal_vector.length() > 0.7:
         return
@@ -541,28 +698,58 @@ def make_shot(board: Board, player: Player, speed=True):
         if min(goal_vector.length(), gk_vector.length()) > 0.25:
             return
 
-        return board.set_action(
-            Action.Shot,
+        return (
             goal_vector.normalize() + out_of_line.normalize(),
-            sprint=speed,
-            release_direction=True,
-            power=power,
+            dict(release_direction=True, power=power),
         )
 
     else:
         if min(goal_vector.length(), gk_vector.length()) > 0.22:
             return
 
-        return board.set_action(
-            Action.Shot,
+        return (
             goal_vector.normalize() + out_of_line.normalize(),
-            sprint=speed,
-            release_direction=False,
-            power=power,
+            dict(release_direction=False, power=power),
         )
 
 
+def may_pass(board: Board, player: Player, pass_features=None) -> bool:
+    """
+    False if make_pass surely doesn't pass: no teammate is eligible for any pass type
+    and the pass before the field end isn't needed.
+
+    pass_features of the player can be shared with make_pass.
+    """
+    if board.command_count < 2:
+        return False
+
+    if abs(board.x_min - player.x) < 0.2 and player.role != PlayerRole.GoalKeeper:
+        return True
+
+    teammates = [p for p in board.my_team.values() if p != player]
+    if pass_features is None:
+        pass_features = PassFeatures(board, player)
+    if any(
+        pass_features.can_pass(a, p)
+        for p in teammates
+        for a in (Action.HighPass, Action.LongPass, Action.ShortPass)
+    ):
+        return True
+
+    # the targets are built only if the player is about to leave the field
+    targets = (Target(board=board, player=player, target=p) for p in teammates)
+    return __field_end_pass_direction(board, targets) is not None
+
+
 def maybe_field_end_pass(board, targets, speed):
+    direction = __field_end_pass_direction(board, targets)
+    if direction is not None:
+        return board.set_action(
+            Action.LongPass, direction, power=1, freeze_direction=10, sprint=speed
+        )
+
+
+def __field_end_pass_direction(board, targets):
     player = board.controlled_player
     if player.x < board.x_min + 0.2:
         return
@@ -577,14 +764,10 @@ def maybe_field_end_pass(board, targets, speed):
         )
         if goal_vector.length() < 0.2:
             return
+        elif goal_vector.y < 0:
+            return Action.BottomLeft
         else:
-            if goal_vector.y < 0:
-                direction = Action.BottomLeft
-            else:
-                direction = Action.TopLeft
-            return board.set_action(
-                Action.LongPass, direction, power=1, freeze_direction=10, sprint=speed
-            )
+            return Action.TopLeft
 
     target = None
     for p in targets:
@@ -595,8 +778,4 @@ def maybe_field_end_pass(board, targets, speed):
             target = p
 
     if target:
-        vector = Vector(1, 0)
-        action = Action.LongPass
-        return board.set_action(
-            action, vector, power=1, freeze_direction=10, sprint=speed
-        )
+        return Vector(1, 0)
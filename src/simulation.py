@@ -0,0 +1,134 @@
+import numpy as np
+from typing import Iterable, Optional, Sequence
+from kaggle_environments.envs.football.helpers import Action
+
+from .models import Player, Ball
+from .geometry import Vector
+
+NO_STICK = -1  # keep the current vector
+RELEASE_STICK = -2  # Action.ReleaseDirection, stop the player
+
+SIMULATION_DIRECTIONS = (
+    Action.Right,
+    Action.TopRight,
+    Action.Top,
+    Action.TopLeft,
+    Action.Left,
+    Action.BottomLeft,
+    Action.Bottom,
+    Action.BottomRight,
+)
+
+_STICK_VECTORS = np.array(
+    [
+        [Vector.from_direction(d).x, Vector.from_direction(d).y]
+        for d in SIMULATION_DIRECTIONS
+    ]
+)
+_STICK_CODES = {d: i for i, d in enumerate(SIMULATION_DIRECTIONS)}
+_STICK_CODES[Action.ReleaseDirection] = RELEASE_STICK
+
+
+def stick_codes(sticks: Iterable[Optional[Action]]) -> np.ndarray:
+    """
+    Convert actions to the codes used by simulate_players, None means no stick.
+    """
+    return np.array(
+        [NO_STICK if s is None else _STICK_CODES[s] for s in sticks], dtype=np.int8
+    )
+
+
+def simulate_players(
+    positions: np.ndarray,
+    vectors: np.ndarray,
+    sticks: np.ndarray,
+    sprint: np.ndarray,
+    acceleration: float = 0.006,
+):
+    """
+    Roll out M action sequences for K turns for P players at once.
+
+    positions, vectors: (P, 2) arrays with the current state.
+    sticks: (M, K, P) array of stick codes, see stick_codes.
+    sprint: bool array broadcastable to sticks.
+
+    Every turn follows Player.apply: the stick accelerates the player,
+    the speed is limited by 0.95 * max_speed when sprinting and is set to walk_speed otherwise.
+    Players without a stick keep their vector.
+
+    Returns (M, K + 1, P, 2) arrays of positions and vectors, index 0 is the current state.
+    """
+    sticks = np.asarray(sticks)
+    sprint = np.broadcast_to(sprint, sticks.shape)
+    m, k, p = sticks.shape
+
+    max_speed = Player.max_speed * 0.95
+    walk_speed = Player.walk_speed
+
+    out_positions = np.empty((m, k + 1, p, 2))
+    out_vectors = np.empty((m, k + 1, p, 2))
+    out_positions[:, 0] = positions
+    out_vectors[:, 0] = vectors
+
+    for t in range(k):
+        stick = sticks[:, t]
+        has_stick = stick >= 0
+        vector = out_vectors[:, t] + (
+            _STICK_VECTORS[np.where(has_stick, stick, 0)]
+            * (acceleration * has_stick)[..., None]
+        )
+
+        length = np.sqrt((vector ** 2).sum(axis=-1))
+        limit = np.where(sprint[:, t], np.minimum(length, max_speed), walk_speed)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scale = np.where(length > 0, limit / length, 0)
+        vector = np.where(has_stick[..., None], vector * scale[..., None], vector)
+        vector[stick == RELEASE_STICK] = 0
+
+        out_vectors[:, t + 1] = vector
+        out_positions[:, t + 1] = out_positions[:, t] + vector
+
+    return out_positions, out_vectors
+
+
+def simulate_ball(ball: Ball, turns: int) -> np.ndarray:
+    """
+    Ball trajectory for the next turns as a (turns + 1, 3) array of x, y, z.
+
+    The ball slows down with Ball.windage until it stops, the altitude follows
+    Ball.future_altitude and never goes below the ground.
+    """
+    t = np.arange(turns + 1, dtype=float)
+    out = np.empty((turns + 1, 3))
+
+    speed = ball.speed
+    if speed > 0:
+        tt = np.minimum(t, speed / -ball.windage)
+        distance = speed * tt + ball.windage * tt ** 2 / 2
+        out[:, 0] = ball.x + ball.vector.x / speed * distance
+        out[:, 1] = ball.y + ball.vector.y / speed * distance
+    else:
+        out[:, 0] = ball.x
+        out[:, 1] = ball.y
+
+    out[:, 2] = np.maximum(
+        ball.altitude + ball.vertical_speed * t - ball.gravity * t ** 2 / 2, 0
+    )
+    return out
+
+
+def simulate_board(board, sequences: Sequence[Sequence[Optional[Action]]], sprint=True):
+    """
+    Roll out action sequences of the controlled player, other players keep their vectors.
+
+    Returns (M, K + 1, 22, 2) arrays of positions and vectors, my team goes first.
+    """
+    positions = np.concatenate([board.my_positions, board.opponent_positions])
+    vectors = np.concatenate([board.my_vectors, board.opponent_vectors])
+
+    sequences = np.array([stick_codes(s) for s in sequences], dtype=np.int8)
+    sticks = np.full(sequences.shape + (len(positions),), NO_STICK, dtype=np.int8)
+    sticks[..., board.controlled_player.id] = sequences
+
+    sprint = np.broadcast_to(sprint, sequences.shape)[..., None]
+    return simulate_players(positions, vectors, sticks, sprint)
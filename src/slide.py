@@ -1,34 +1,151 @@
-from copy import deepcopy
-from typing import Optional
+import numpy as np
+from typing import List, Optional
 from kaggle_environments.envs.football.helpers import Action, PlayerRole
 
 from .board import Board
-from .models import Player, Ball, speed_interval
+from .models import Player, first_intercept_time, DEFAULT_TURNS_TO_FUTURE
 from .logger import logger
-from .geometry import Line, Vector, euclidean_distance, angle_between_vectors
+from .geometry import Line, Vector, euclidean_distance
+
+
+class DefenceSituation:
+    """
+    Defensive analysis of the step, built once by slide_action and shared
+    by the slide decisions.
+    """
+
+    def __init__(self, board: Board):
+        self.board = board
+        player = board.controlled_player
+        ball = board.ball
+
+        self.player_position = player.future_position()
+        self.ball_position = ball.future_position()
+        self.behind_ball = (
+            self.ball_position.x < self.player_position.x and ball.x < player.x
+        )
+
+        self.ball_to_goal = Line(self.ball_position, board.my_goal_position)
+        self.intercept_vector = self.ball_to_goal.get_short_direction(
+            self.player_position
+        )
+        self.intercept_distance = self.intercept_vector.length()
+
+        self._defence_teammates = None
+        self._can_slide = None
+
+    def __repr__(self):
+        return (
+            f"DefenceSituation(behind_ball={self.behind_ball}, "
+            f"intercept_distance={round(self.intercept_distance, 3)})"
+        )
+
+    @property
+    def defence_teammates(self) -> List[Player]:
+        """
+        Teammates behind the controlled player, between him and the goal.
+        """
+        if self._defence_teammates is None:
+            self._defence_teammates = self._find_defence_teammates()
+        return self._defence_teammates
+
+    @property
+    def can_slide(self) -> bool:
+        """
+        The controlled player may slide at all: no yellow card, the ball is
+        controlled, the player is running and stays out of the penalty area.
+        """
+        if self._can_slide is None:
+            board = self.board
+            player = board.controlled_player
+            self._can_slide = not (
+                player.yellow_card
+                or not board.ball.player
+                or player.speed < 0.009
+                or board.is_my_penalty_area(player.position)
+                or board.is_my_penalty_area(player.future_position())
+            )
+        return self._can_slide
+
+    def should_slide(self, intercept_time: float) -> bool:
+        if not self.can_slide:
+            return False
+
+        if intercept_time < 20:
+            return False
+
+        board = self.board
+        player, ball = board.controlled_player, board.ball
+        defence_teammates = self.defence_teammates
+        ball_distance = euclidean_distance(player.position, ball.position)
+        opponent_distance = euclidean_distance(player.position, ball.player.position)
+
+        logger.debug(
+            f"Should slide: defence_teammates = {defence_teammates}, "
+            f"ball_distance = {ball_distance}, "
+            f"opponent_distance = {opponent_distance}, "
+            f"intercept_time = {intercept_time}."
+        )
+
+        if defence_teammates and ball_distance < 0.025:
+            return True
+
+        if not defence_teammates and opponent_distance < 0.025:
+            return True
+
+        return False
+
+    def _find_defence_teammates(self) -> List[Player]:
+        board = self.board
+        controlled_player = board.controlled_player
+        goal_vector = Vector.from_point(board.my_goal_position - self.player_position)
+
+        teammates = [
+            p
+            for p in board.my_team.values()
+            if p != controlled_player and p.role != PlayerRole.GoalKeeper
+        ]
+        if not teammates or goal_vector.is_empty():
+            return []
+
+        ids = [p.id for p in teammates]
+        positions = board.my_positions[ids]
+        future_positions = positions + board.my_vectors[ids] * DEFAULT_TURNS_TO_FUTURE
+
+        dx = self.player_position.x - future_positions[:, 0]
+        dy = self.player_position.y - future_positions[:, 1]
+        n = np.sqrt(dx ** 2 + dy ** 2)
+        goal_vector = goal_vector.normalize()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s = goal_vector.x * (dx / n) + goal_vector.y * (dy / n)
+        # same angle as angle_between_vectors
+        angle = np.abs(np.arccos(np.clip(s, -1, 1)))
+
+        is_cover = (
+            (positions[:, 0] <= controlled_player.x)
+            & ((dx != 0) | (dy != 0))
+            & (angle < 30)
+        )
+        return [p for p, c in zip(teammates, is_cover) if c]
 
 
 def slide_action(board: Board, opponent: Optional[Player] = None) -> Action:
+    situation = DefenceSituation(board)
     if board.ball.player is None:
         # nobody controls the ball
-        return apply_back_defence(board, opponent)
+        return apply_back_defence(board, situation, opponent)
 
-    ball_position = board.ball.future_position()
-    player_position = board.controlled_player.future_position()
-    if ball_position.x < player_position.x and board.ball.x < board.controlled_player.x:
-        # behind the ball
-        return apply_back_defence(board, opponent)
+    if situation.behind_ball:
+        return apply_back_defence(board, situation, opponent)
 
-    ball_to_goal = Line(ball_position, board.my_goal_position)
-    intercept_vector = ball_to_goal.get_short_direction(player_position)
-    if intercept_vector.length() > 0.1:
+    if situation.intercept_distance > 0.1:
         # too far for intercept
-        return apply_back_defence(board, opponent)
+        return apply_back_defence(board, situation, opponent)
 
-    return apply_front_defence(board)
+    return apply_front_defence(board, situation)
 
 
-def apply_front_defence(board: Board) -> Action:
+def apply_front_defence(board: Board, situation: DefenceSituation) -> Action:
     """
     Stand on the line between the goal and the ball
     """
@@ -36,11 +153,10 @@ def apply_front_defence(board: Board) -> Action:
     player = board.controlled_player
     slide_threshold = player.max_speed + player.body_radius
     ball = board.ball
-    player_position = player.future_position()
-    ball_position = ball.future_position()
+    player_position = situation.player_position
+    ball_position = situation.ball_position
 
-    ball_to_goal = Line(ball_position, board.my_goal_position)
-    intercept_vector = ball_to_goal.get_short_direction(player_position)
+    intercept_vector = situation.intercept_vector
     player_to_ball = Vector.from_point(ball_position - player_position)
 
     sprint = True
@@ -63,7 +179,9 @@ def apply_front_defence(board: Board) -> Action:
 
 
 def apply_back_defence(
-    board: Board, opponent: Optional[Player] = None
+    board: Board,
+    situation: DefenceSituation,
+    opponent: Optional[Player] = None,
 ) -> Optional[Action]:
     """
     Move to intercept.
@@ -77,25 +195,22 @@ def apply_back_defence(
 
     if opponent.vector.x < 0:
         # trying to predict opponent's next move
-        new_vector = __get_opponent_vector(board, opponent)
-        opponent = deepcopy(opponent)
-        opponent.vector = new_vector
+        opponent = opponent.with_vector(__get_opponent_vector(board, opponent))
 
-    intercept_interval = speed_interval(opponent.position, opponent.vector, opponent=player)
-    if intercept_interval:
-        target = opponent.future_position(turns=intercept_interval.lower() + 3)
+    intercept_time, _ = first_intercept_time(opponent.position, opponent.vector, player)
+    if np.isfinite(intercept_time):
+        target = opponent.future_position(turns=intercept_time + 3)
     else:
         target = opponent.future_position(turns=5)
 
     vector = Vector.from_point(target - player.position)
 
-    should_slide = __should_slide(board, player, ball, intercept_interval)
-    action = Action.Slide if should_slide else None
+    action = Action.Slide if situation.should_slide(intercept_time) else None
     logger.debug(
         "Slide action: Move to intercept, "
         f"opponent = {opponent}, "
         f"action = {action}, "
-        f"intercept_interval = {intercept_interval}, "
+        f"intercept_time = {intercept_time}, "
         f"intercept_vector = {vector}."
     )
     return board.set_action(action, vector, sprint=True, dribble=False)
@@ -106,11 +221,12 @@ def __get_opponent_vector(board: Board, opponent: Player):
 
     target = None
     if ball.player != opponent:
-        interval = ball.get_intercept_interval(board, opponent, height=opponent.height)
+        race = board.ball_race
+        interval = race.interval(opponent)
         if interval:
             target = ball.future_position(interval.lower())
         else:
-            height_interval = ball.height_interval(height=opponent.height)
+            height_interval = race.height_interval(opponent)
             if height_interval:
                 target = ball.future_position(height_interval.lower())
             else:
@@ -128,58 +244,3 @@ def __get_opponent_vector(board: Board, opponent: Player):
     speed = opponent.max_speed * 0.95
 
     return vector.normalize() * speed
-
-
-def __should_slide(board: Board, player: Player, ball: Ball, intercept_interval):
-
-    if (
-        player.yellow_card
-        or not ball.player
-        or player.speed < 0.009
-        or board.is_my_penalty_area(player.position)
-        or board.is_my_penalty_area(player.future_position())
-    ):
-        return False
-
-    if intercept_interval and intercept_interval.lower() < 20:
-        return False
-
-    defence_teammates = __defence_teammates(board)
-    ball_distance = euclidean_distance(player.position, ball.position)
-    opponent_distance = euclidean_distance(player.position, ball.player.position)
-
-    logger.debug(
-        f"Should slide: defence_teammates = {defence_teammates}, ball_distance = {ball_distance}, "
-        f"opponent_distance = {opponent_distance}, intercept_interval = {intercept_interval}."
-    )
-
-    if defence_teammates and ball_distance < 0.025:
-        return True
-
-    if not defence_teammates and opponent_distance < 0.025:
-        return True
-
-    return False
-
-
-def __defence_teammates(board):
-    controlled_player = board.controlled_player
-    goal_vector = Vector.from_point(
-        board.my_goal_position - controlled_player.future_position()
-    )
-    defence_teammates = []
-    for p in board.my_team.values():
-        if (
-            p == controlled_player
-            or p.x > controlled_player.x
-            or p.role == PlayerRole.GoalKeeper
-        ):
-            continue
-
-        teammate_to_controlled = Vector.from_point(
-            controlled_player.future_position() - p.future_position()
-        )
-        angle = abs(angle_between_vectors(goal_vector, teammate_to_controlled))
-        if angle < 30:
-            defence_teammates.append(p)
-    return defence_teammates
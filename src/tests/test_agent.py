@@ -0,0 +1,126 @@
+import unittest
+import numpy as np
+
+import agent as agent_module
+from agent import agent, agent_step
+from src.board import (
+    SearchHints,
+    default_decision_state,
+    load_decision_state,
+    save_decision_state,
+)
+from tools.observations import random_episode
+
+STEPS = 40
+
+
+def summary(decision_state: dict):
+    state = {
+        name: repr(value)
+        for name, value in decision_state.items()
+        if name not in ("last_commands",)
+    }
+    commands = decision_state["last_commands"]
+    state["last_commands"] = (
+        len(commands),
+        commands.steps_since_shot,
+        repr(commands._commands),
+    )
+    return state
+
+
+def board_summary(board):
+    return (
+        board.step,
+        board.controlled_player.id,
+        board.my_positions.tolist(),
+        board.opponent_positions.tolist(),
+        repr(board.ball),
+    )
+
+
+def play_alone(episode, search_hints: SearchHints = None):
+    """
+    Actions, decision states and the board of agent() playing one game.
+    """
+    agent_module._BOARD = None
+    decision_state = default_decision_state()
+    if search_hints is not None:
+        decision_state["search_hints"] = search_hints
+    load_decision_state(decision_state)
+
+    actions, states = [], []
+    for obs in episode:
+        actions.append(agent({"players_raw": [obs]}))
+        states.append(summary(save_decision_state()))
+    return actions, states, board_summary(agent_module._BOARD)
+
+
+class NoHints(SearchHints):
+    def failed(self, name: str) -> bool:
+        return False
+
+
+def played_boards(seeds=range(3)):
+    """
+    The board after every action of agent() playing random games, with the command history.
+    """
+    for seed in seeds:
+        agent_module._BOARD = None
+        load_decision_state(default_decision_state())
+        for obs in random_episode(seed, steps=STEPS):
+            agent({"players_raw": [obs]})
+            yield agent_module._BOARD
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_agent.py
+    """
+
+    def setUp(self):
+        self.episodes = [list(random_episode(seed, steps=STEPS)) for seed in range(3)]
+
+    def tearDown(self):
+        agent_module._BOARD = None
+        load_decision_state(default_decision_state())
+
+    def test_agent_step(self):
+        expected = [play_alone(episode) for episode in self.episodes]
+
+        # the global state of agent() in the middle of another game
+        play_alone(self.episodes[0][:10])
+        global_board, global_state = agent_module._BOARD, summary(save_decision_state())
+
+        # the games in lockstep, every one with its own state
+        states = [None] * len(self.episodes)
+        for step in range(STEPS):
+            for game, episode in enumerate(self.episodes):
+                action, states[game] = agent_step({"players_raw": [episode[step]]}, states[game])
+                self.assertEqual(action, expected[game][0][step])
+                self.assertEqual(summary(states[game][1]), expected[game][1][step])
+
+        for game, (board, _) in enumerate(states):
+            self.assertEqual(board_summary(board), expected[game][2])
+
+        self.assertIs(agent_module._BOARD, global_board)
+        self.assertEqual(summary(save_decision_state()), global_state)
+
+    def test_new_game(self):
+        action, (board, _) = agent_step({"players_raw": [self.episodes[0][0]]})
+        self.assertEqual(action, play_alone(self.episodes[0][:1])[0][0])
+        self.assertIsNot(board, agent_module._BOARD)
+        self.assertTrue(np.isfinite(board.my_positions).all())
+
+    def test_search_hints(self):
+        for episode in self.episodes:
+            actions, states, _ = play_alone(episode)
+            self.assertTrue(any("failed=[]" not in state["search_hints"] for state in states))
+
+            # every search runs
+            expected, _, _ = play_alone(episode, search_hints=NoHints())
+            self.assertEqual(actions, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
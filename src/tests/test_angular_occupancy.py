@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+
+from src.geometry import AngularOccupancy, angle_to_direction
+from src.portion import Interval
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_angular_occupancy.py
+    """
+
+    def test_blocked_directions(self):
+        rng = np.random.RandomState(0)
+        for _ in range(100):
+            angles = rng.uniform(-180, 180, rng.randint(0, 5))
+            occupancy = AngularOccupancy(angles)
+            self.assertEqual(
+                occupancy.blocked_directions(),
+                {angle_to_direction(a, grade=True) for a in angles},
+            )
+
+    def test_interval(self):
+        occupancy = AngularOccupancy([10, -60.4], half_sizes=[5, 2])
+        self.assertEqual(occupancy.to_interval(), Interval((-62, -58), (5, 15)))
+        self.assertTrue(occupancy.is_blocked(14.6))
+        self.assertFalse(occupancy.is_blocked(15.6))
+        self.assertEqual(occupancy.free_gaps(), [(-57, 4), (16, -63)])
+
+    def test_wrap_around(self):
+        for angle in (180, -180):
+            occupancy = AngularOccupancy([angle], half_sizes=[4])
+            self.assertEqual(occupancy.to_interval(), Interval((-180, -176), (176, 180)))
+            self.assertEqual(occupancy.blocked_runs(), [(176, -176)])
+            self.assertTrue(occupancy.is_blocked(180))
+            self.assertTrue(occupancy.is_blocked(-180))
+            self.assertFalse(occupancy.is_blocked(175))
+
+        occupancy = AngularOccupancy([178], half_sizes=[4])
+        self.assertEqual(occupancy.to_interval(), Interval((-180, -178), (174, 180)))
+
+    def test_empty_and_full(self):
+        self.assertEqual(AngularOccupancy([]).free_gaps(), [(-180, 179)])
+        self.assertFalse(AngularOccupancy([]).to_interval())
+
+        full = AngularOccupancy([0], half_sizes=[180])
+        self.assertEqual(full.free_gaps(), [])
+        self.assertEqual(full.blocked_directions(), {angle_to_direction(a) for a in range(-180, 180, 45)})
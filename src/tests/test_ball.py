@@ -0,0 +1,139 @@
+import unittest
+import numpy as np
+from kaggle_environments.envs.football.helpers import PlayerRole
+
+from src.board import Board
+from src.models import Ball, BallRace, Kinematics, Player, height_cache_info
+from src.geometry import Point, Vector
+from src.portion import Interval
+from src.tests.test_board import make_obs
+
+
+def race_boards():
+    rng = np.random.RandomState(0)
+    for seed in range(30):
+        obs = make_obs(shift=rng.uniform(-0.5, 0.5), seed=seed)
+        obs["ball_owned_team"] = -1
+        obs["ball"] = [rng.uniform(-0.9, 0.9), rng.uniform(-0.4, 0.4), 0.11]
+        obs["ball_direction"] = [*rng.normal(0, 0.02, 2), rng.uniform(-0.01, 0.05)]
+        if seed % 10 == 0:
+            obs["ball_direction"] = [0.0, 0.0, 0.0]
+        yield Board(obs)
+
+
+def first_at_ball(board, players):
+    # exhaustive search, as without_ball did it before the race table
+    ball = board.ball
+    first_player, min_t = None, np.inf
+    for p in players:
+        interval = ball.get_intercept_interval(board, p, height=p.height)
+        if interval and interval.lower() < min_t:
+            first_player, min_t = p, interval.lower()
+    return first_player, min_t
+
+
+def make_ball(altitude, vertical_speed):
+    return Ball(
+        position=Point(0, 0),
+        vector=Vector(0.01, 0),
+        altitude=altitude,
+        vertical_speed=vertical_speed,
+    )
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_ball.py
+    """
+
+    def test_state(self):
+        player = Player(
+            id=0,
+            position=Point(0.1, 0.2),
+            vector=Vector(0.005, -0.002),
+            role=PlayerRole.CentralFront,
+        )
+        state = player.state
+        self.assertEqual(state, Kinematics(Point(0.1, 0.2), Vector(0.005, -0.002)))
+        self.assertNotEqual(state, state.with_vector(Vector(0, 0)))
+        self.assertNotEqual(state, None)
+        self.assertNotEqual(state, (state.position, state.vector))
+        with self.assertRaises(AttributeError):
+            state.position = Point(0, 0)
+
+        moved = player.with_position(Point(0.3, 0.2))
+        self.assertEqual(player.position, Point(0.1, 0.2))
+        self.assertEqual(moved.state, state.with_position(Point(0.3, 0.2)))
+
+    def test_height_interval(self):
+        ball = make_ball(altitude=0.1, vertical_speed=0)
+        self.assertEqual(ball.height_interval(0.5), Interval(0, np.inf))
+
+        ball = make_ball(altitude=1, vertical_speed=0)
+        t = np.sqrt(2 * 0.5 / ball.gravity)
+        interval = ball.height_interval(0.5)
+        self.assertAlmostEqual(interval.lower(), t)
+        self.assertEqual(interval.upper(), np.inf)
+        self.assertAlmostEqual(ball.future_altitude(ball.height_roots(0.5)[1]), 0.5)
+
+        ball = make_ball(altitude=0.1, vertical_speed=0.2)
+        interval = ball.height_interval(0.3)
+        self.assertEqual(len(interval.borders), 2)
+        t1, t2 = ball.height_roots(0.3)
+        self.assertEqual(interval, Interval((0, t1), (t2, np.inf)))
+
+    def test_cache(self):
+        make_ball(altitude=0.123, vertical_speed=0.01).height_interval(0.5)
+        hits = height_cache_info()["interval"].hits
+
+        # a new ball in the same state
+        make_ball(altitude=0.123, vertical_speed=0.01).height_interval(0.5)
+        self.assertEqual(height_cache_info()["interval"].hits, hits + 1)
+
+    def test_ball_race(self):
+        for board in race_boards():
+            ball, race = board.ball, BallRace(board)
+            self.assertEqual(len(race.players), 22)
+            for p in race.players:
+                interval = ball.get_intercept_interval(board, p, height=p.height)
+                self.assertEqual(race.interval(p), interval)
+                if interval:
+                    self.assertEqual(race.time(p), interval.lower())
+                    self.assertEqual(race.position(p), ball.future_position(interval.lower()))
+                else:
+                    self.assertEqual(race.time(p), np.inf)
+                    self.assertIsNone(race.position(p))
+            self.assertEqual(race.solved, 22)
+
+            player, t = race.first()
+            self.assertEqual(t, min(race.times))
+            if player is not None:
+                self.assertIs(race.players[race.times.index(t)], player)
+
+    def test_ball_race_first(self):
+        solved, total = 0, 0
+        for board in race_boards():
+            for opponent, team in ((True, board.opponent_team), (False, board.my_team)):
+                race = BallRace(board)
+                for p, t in zip(race.players, race.bounds):
+                    self.assertLessEqual(t, race.time(p))
+
+                race = BallRace(board)
+                self.assertEqual(
+                    race.first(opponent=opponent), first_at_ball(board, team.values())
+                )
+                solved += race.solved
+                total += len(team)
+
+            race = BallRace(board)
+            self.assertEqual(
+                race.first(),
+                first_at_ball(board, [*board.my_team.values(), *board.opponent_team.values()]),
+            )
+
+        # the bounds prune a part of the exact solutions
+        self.assertLess(solved, total)
+
+
+if __name__ == "__main__":
+    unittest.main()
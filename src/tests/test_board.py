@@ -0,0 +1,204 @@
+import unittest
+import numpy as np
+
+from src.board import (
+    Action,
+    Board,
+    CommandHistory,
+    GameMode,
+    Point,
+    SearchHints,
+    Vector,
+    save_decision_state,
+    load_decision_state,
+    mirror_observation,
+)
+
+
+def make_obs(steps_left=3000, shift=0.0, active=None, seed=0):
+    rng = np.random.RandomState(seed)
+    obs = {
+        "ball": [shift, 0.0, 0.11],
+        "ball_direction": [0.01, 0.0, 0.0],
+        "ball_owned_team": 0,
+        "ball_owned_player": 5,
+        "game_mode": 0,
+        "score": [0, 0],
+        "steps_left": steps_left,
+        "active": 5,
+        "sticky_actions": [0] * 10,
+    }
+    roles = [0, 1, 2, 2, 3, 4, 5, 6, 6, 7, 9]
+    for side in ("left", "right"):
+        positions = rng.uniform(-0.4, 0.4, (11, 2)) + [shift, 0]
+        obs[f"{side}_team"] = positions.tolist()
+        obs[f"{side}_team_direction"] = [[shift / 10, 0.001]] * 11
+        obs[f"{side}_team_roles"] = roles
+        obs[f"{side}_team_tired_factor"] = [0.0] * 11
+        obs[f"{side}_team_active"] = active or [True] * 11
+        obs[f"{side}_team_yellow_card"] = [False] * 11
+    return obs
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_board.py
+    """
+
+    def assertSameBoard(self, b1, b2):
+        self.assertEqual(b1.step, b2.step)
+        self.assertEqual(b1.sticky_actions, b2.sticky_actions)
+        self.assertEqual(b1.controlled_player.id, b2.controlled_player.id)
+        self.assertEqual(b1.my_gk.id, b2.my_gk.id)
+        self.assertEqual(b1.opponent_gk.id, b2.opponent_gk.id)
+        for t1, t2 in ((b1.my_team, b2.my_team), (b1.opponent_team, b2.opponent_team)):
+            self.assertEqual(t1.keys(), t2.keys())
+            for id in t1:
+                self.assertEqual(t1[id].position, t2[id].position)
+                self.assertEqual(t1[id].vector, t2[id].vector)
+                self.assertEqual(t1[id].role, t2[id].role)
+        self.assertEqual(b1.ball.position, b2.ball.position)
+        self.assertEqual(b1.ball.player.id, b2.ball.player.id)
+
+    def test_update(self):
+        board = Board(make_obs(steps_left=3000))
+        ball = board.ball
+        players = dict(board.my_team)
+
+        obs = make_obs(steps_left=2999, shift=0.1)
+        board.update(obs)
+        self.assertSameBoard(board, Board(obs))
+
+        self.assertIs(board.ball, ball)
+        self.assertIs(board.my_team[3], players[3])
+        self.assertEqual(board.my_positions[3, 0], board.my_team[3].x)
+        self.assertEqual(board.my_positions[3, 1], board.my_team[3].y)
+
+    def test_acceleration(self):
+        board = Board(make_obs(steps_left=3000))
+        self.assertEqual(list(board.my_accelerations[1]), [0, 0])
+
+        board.update(make_obs(steps_left=2999, shift=0.1))
+        self.assertAlmostEqual(board.my_accelerations[1, 0], 0.01)
+        self.assertAlmostEqual(board.my_accelerations[1, 1], 0)
+
+        # not consecutive step, nothing to compare with
+        board.update(make_obs(steps_left=2000, shift=0.2))
+        self.assertEqual(list(board.my_accelerations[1]), [0, 0])
+
+    def test_active_change(self):
+        board = Board(make_obs(steps_left=3000))
+        active = [True] * 11
+        active[4] = False
+
+        obs = make_obs(steps_left=2999, active=active)
+        board.update(obs)
+        self.assertNotIn(4, board.my_team)
+        self.assertSameBoard(board, Board(obs))
+        self.assertEqual(board.my_team[1].position, Point(*board.my_positions[1]))
+
+    def test_lazy_set_piece(self):
+        eager = Board(make_obs(steps_left=3000))
+        eager.lazy_game_modes = set()
+        lazy = Board(make_obs(steps_left=3000))
+
+        modes = [GameMode.Corner, GameMode.Corner, GameMode.Normal, GameMode.FreeKick]
+        for i, mode in enumerate(modes, start=1):
+            obs = make_obs(steps_left=3000 - i, shift=0.1 * i)
+            obs["game_mode"] = mode.value
+            eager.update(obs)
+            lazy.update(obs)
+
+            if mode != GameMode.Normal:
+                # only the controlled player and the ball owner are up to date
+                self.assertTrue(lazy._pending["right"])
+            self.assertEqual(lazy.controlled_player.position, eager.controlled_player.position)
+            self.assertEqual(lazy.ball.player.position, eager.ball.player.position)
+
+        self.assertSameBoard(lazy, eager)
+        np.testing.assert_array_equal(lazy.my_accelerations, eager.my_accelerations)
+        np.testing.assert_array_equal(
+            lazy.opponent_accelerations, eager.opponent_accelerations
+        )
+        self.assertFalse(lazy._pending["right"])
+
+    def test_mirror_observation(self):
+        obs = make_obs(seed=3)
+        obs["score"] = [2, 1]
+        mirrored = mirror_observation(obs, active=7, sticky_actions=[1] + [0] * 9)
+        self.assertEqual(mirror_observation(mirrored, active=5), obs)
+
+        board, mirrored_board = Board(obs), Board(mirrored)
+        self.assertEqual(mirrored_board.score, (1, 2))
+        self.assertEqual(mirrored_board.controlled_player.id, 7)
+        self.assertTrue(mirrored_board.ball.player.is_opponent)
+        self.assertEqual(mirrored_board.ball.player.id, board.ball.player.id)
+        np.testing.assert_array_equal(
+            mirrored_board.my_positions, -board.opponent_positions
+        )
+        np.testing.assert_array_equal(
+            mirrored_board.opponent_vectors, -board.my_vectors
+        )
+        self.assertEqual(mirrored_board.ball.position, board.ball.position * -1)
+
+    def test_command_history(self):
+        history = CommandHistory(size=4)
+        self.assertIsNone(history.last())
+
+        for action in (Action.Shot, None, Action.ShortPass, Action.ShortPass, None):
+            history.append(action, 1)
+
+        self.assertEqual(len(history), 5)
+        self.assertEqual(history.last(), (None, 1))
+        self.assertEqual(history.count(Action.ShortPass, 4), 2)
+        self.assertEqual(history.count(Action.ShortPass, 2), 1)
+        # the shot is out of the buffer
+        self.assertEqual(history.count(Action.Shot, 4), 0)
+        self.assertEqual(history.steps_since_shot, 4)
+        self.assertRaises(ValueError, history.count, Action.Shot, 5)
+
+        history.clear()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.count(Action.ShortPass, 4), 0)
+
+    def test_decision_state(self):
+        board = Board(make_obs(steps_left=3000))
+        board.set_action(Action.ShortPass, Vector(1, 0), freeze_direction=10)
+        state = save_decision_state()
+
+        board.update(make_obs(steps_left=2999))
+        action = board.set_action(None, Vector(0, 1))
+        self.assertEqual(action, Action.Right)  # frozen direction
+        self.assertNotEqual(save_decision_state()["freezed_direction_count"], 10)
+
+        load_decision_state(state)
+        self.assertEqual(save_decision_state()["freezed_direction_count"], 10)
+        self.assertEqual(board.command_count, 1)
+
+    def test_search_hints(self):
+        hints = SearchHints()
+        self.assertFalse(hints.failed("shot"))
+        hints.set("shot", True)
+        hints.set("pass", False)
+        self.assertTrue(hints.failed("shot"))
+        self.assertFalse(hints.failed("pass"))
+        self.assertEqual(repr(hints), "SearchHints(failed=['shot'])")
+        hints.clear()
+        self.assertFalse(hints.failed("shot"))
+
+    def test_search_hints_decision_state(self):
+        self.addCleanup(load_decision_state, save_decision_state())
+        board = Board(make_obs(steps_left=3000))
+        board.search_hints.set("pass", True)
+        state = save_decision_state()
+
+        board.update(make_obs(steps_left=2999))
+        self.assertTrue(board.search_hints.failed("pass"))
+        board.search_hints.set("pass", False)
+
+        load_decision_state(state)
+        self.assertTrue(board.search_hints.failed("pass"))
+
+        # cleared with the strategy when another player is controlled
+        board.update(dict(make_obs(steps_left=2998), active=6))
+        self.assertFalse(board.search_hints.failed("pass"))
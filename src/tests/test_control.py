@@ -0,0 +1,42 @@
+import unittest
+
+from src import control
+from src.board import default_decision_state, load_decision_state
+from src.tests.test_agent import played_boards
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_control.py
+    """
+
+    def test_reachable_opponents(self):
+        self.addCleanup(load_decision_state, default_decision_state())
+        reachable_opponents = getattr(control, "__reachable_opponents")
+        opponent_time = getattr(control, "__opponent_time")
+
+        time_th, skipped = 15, 0
+        for board in played_boards():
+            player = board.controlled_player
+            players = [
+                player.apply(stick, speed)
+                for stick in board.available_directions
+                for speed in (True, False)
+            ]
+            opponents = reachable_opponents(board, players, time_th)
+            for p, reachable in zip(players, opponents):
+                skipped += len(board.opponent_team) - 1 - len(reachable)
+
+                # the capped time is the one of the search over all opponents
+                expected = min(opponent_time(board, p), time_th)
+                self.assertEqual(min(opponent_time(board, p, reachable), time_th), expected)
+
+                for x in board.opponent_team.values():
+                    if x not in reachable:
+                        self.assertGreaterEqual(opponent_time(board, p, [x]), time_th)
+
+        self.assertGreater(skipped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import numpy as np
+
+from src.board import Board
+from src.geometry import Field, Point, Vector
+from src.models import field_interval, field_times
+from src.portion import Interval
+from src.tests.test_board import make_obs
+
+
+def line_border_distance(field, p):
+    return min(
+        line.get_short_direction(p, infinity_line=True).length()
+        for line in field.borders
+    )
+
+
+def interval_field_times(field, x, y, dx, dy):
+    interval = Interval(0, np.inf)
+    for p, d, p_min, p_max in ((x, dx, field.x_min, field.x_max), (y, dy, field.y_min, field.y_max)):
+        if d:
+            interval &= Interval(*sorted([(p_min - p) / d, (p_max - p) / d]))
+    return interval
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_field.py
+    """
+
+    def setUp(self):
+        self.field = Field(-1, 1, -0.42, 0.42)
+        self.points = np.random.RandomState(0).uniform(-1.2, 1.2, (200, 2))
+        self.vectors = np.random.RandomState(1).normal(0, 0.02, (200, 2))
+        self.vectors[::7, 0] = 0
+        self.vectors[::11, 1] = 0
+
+    def test_border_distance(self):
+        distances = self.field.border_distance(self.points)
+        for (x, y), d in zip(self.points, distances):
+            p = Point(x, y)
+            expected = line_border_distance(self.field, p)
+            self.assertEqual(self.field.border_distance(p), expected)
+            self.assertEqual(d, expected)
+
+    def test_contains(self):
+        inside = self.field.contains(self.points)
+        for (x, y), c in zip(self.points, inside):
+            self.assertEqual(c, Point(x, y) in self.field)
+
+    def test_slab_times(self):
+        enter, exit = self.field.slab_times(
+            self.points[:, 0], self.points[:, 1], self.vectors[:, 0], self.vectors[:, 1]
+        )
+        exit_time = self.field.exit_time(
+            self.points[:, 0], self.points[:, 1], self.vectors[:, 0], self.vectors[:, 1]
+        )
+        for i, ((x, y), (dx, dy)) in enumerate(zip(self.points, self.vectors)):
+            expected = interval_field_times(self.field, x, y, dx, dy)
+            scalar = self.field.slab_times(x, y, dx, dy)
+            self.assertEqual(Interval(*scalar), expected)
+            self.assertEqual(Interval(enter[i], exit[i]), expected)
+            if expected.empty():
+                self.assertTrue(np.isnan(exit_time[i]))
+            else:
+                self.assertEqual(exit_time[i], expected.upper())
+
+    def test_exit_time(self):
+        self.assertEqual(self.field.exit_time(0, 0, 0.1, 0), 10)
+        self.assertEqual(self.field.exit_time(0, 0, 0, 0), np.inf)
+        self.assertTrue(np.isnan(self.field.exit_time(2, 0, 0.1, 0)))
+        self.assertEqual(self.field.exit_time(2, 0, -0.1, 0), 30)
+
+    def test_field_times(self):
+        board = Board(make_obs())
+        origin = Point(0.2, -0.1)
+        for positions in ([origin.x, origin.y], self.points):
+            enter, exit = field_times(positions, self.vectors, board)
+            self.assertEqual(enter.shape, (len(self.vectors),))
+            for i, v in enumerate(self.vectors):
+                p = Point(*positions[i]) if positions is self.points else origin
+                expected = field_interval(p, Vector(*v), board)
+                self.assertEqual(Interval(enter[i], exit[i]), expected)
+                if expected:
+                    self.assertEqual(exit[i], expected.upper())
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+
+from src.geometry import Field, GoalVisibility, Point, Vector
+
+POSTS = (Point(1, -0.055), Point(1, 0.055))
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_goal_visibility.py
+    """
+
+    def setUp(self):
+        self.visibility = GoalVisibility(POSTS, Field(0, 0.9, -0.63, 0.63))
+
+    @staticmethod
+    def exact(p):
+        return [Vector.from_point(post - p).angle(grade=True) for post in POSTS]
+
+    def test_nodes(self):
+        for x, y in ((0, -0.63), (0.5, 0.1), (0.9, 0.63), (0.3, 0)):
+            p = Point(x, y)
+            np.testing.assert_allclose(self.visibility.post_angles(p), self.exact(p))
+
+    def test_interpolation(self):
+        points = np.random.RandomState(0).uniform((0, -0.63), (0.9, 0.63), (500, 2))
+        for x, y in points:
+            p = Point(x, y)
+            np.testing.assert_allclose(
+                self.visibility.post_angles(p), self.exact(p), atol=0.05
+            )
+
+    def test_outside(self):
+        for x, y in ((0.95, 0.01), (-0.5, 0.2), (0.5, 0.7), (1.1, 0)):
+            p = Point(x, y)
+            self.assertEqual(self.visibility.post_angles(p), self.exact(p))
+
+    def test_goal_angle(self):
+        self.assertAlmostEqual(
+            self.visibility.goal_angle(Point(0.5, 0)),
+            2 * np.degrees(np.arctan(0.055 / 0.5)),
+            places=3,
+        )
+        self.assertGreater(
+            self.visibility.goal_angle(Point(0.8, 0)),
+            self.visibility.goal_angle(Point(0.8, 0.4)),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from kaggle_environments.envs.football.helpers import PlayerRole
+
+from src.geometry import Point, Vector
+from src.models import (
+    Ball,
+    Player,
+    speed_interval,
+    first_intercept_time,
+    first_intercept_times,
+)
+
+
+def make_players(rng, n=5):
+    return [
+        Player(
+            id=i,
+            position=Point(*rng.uniform(-0.5, 0.5, 2)),
+            vector=Vector(0, 0),
+            role=PlayerRole.CenterBack,
+            is_opponent=True,
+        )
+        for i in range(n)
+    ]
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_intercept.py
+    """
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.players = make_players(rng)
+        self.position = Point(0.1, -0.05)
+        vectors = list(rng.normal(0, 0.02, (100, 2)))
+        # zero speed and the max speed of the players
+        vectors += [np.zeros(2), np.array([Player.max_speed, 0])]
+        self.vectors = np.array(vectors)
+
+    def assertSameTime(self, t, interval):
+        if interval:
+            self.assertEqual(t, interval.lower())
+        else:
+            self.assertEqual(t, np.inf)
+
+    def test_first_intercept_time(self):
+        for acceleration in (0, Ball.windage):
+            for v in self.vectors:
+                vector = Vector(*v)
+                t, player = first_intercept_time(
+                    self.position, vector, self.players, acceleration=acceleration
+                )
+                interval = speed_interval(
+                    self.position, vector, self.players, acceleration=acceleration
+                )
+                self.assertSameTime(t, interval)
+
+                if player is None:
+                    continue
+
+                first = next(
+                    p
+                    for p in self.players
+                    if speed_interval(
+                        self.position, vector, p, acceleration=acceleration
+                    ).lower()
+                    == t
+                )
+                self.assertIs(player, first)
+
+    def test_first_intercept_times(self):
+        for acceleration in (0, Ball.windage):
+            times, indices = first_intercept_times(
+                [self.position.x, self.position.y],
+                self.vectors,
+                self.players,
+                acceleration=acceleration,
+            )
+            for v, t, i in zip(self.vectors, times, indices):
+                expected, player = first_intercept_time(
+                    self.position, Vector(*v), self.players, acceleration=acceleration
+                )
+                self.assertEqual(t, expected)
+                self.assertEqual(i, self.players.index(player) if player else -1)
+
+    def test_touch(self):
+        player = self.players[0]
+        t, p = first_intercept_time(player.position, Vector(0.01, 0), player)
+        self.assertEqual(t, 0)
+        self.assertIs(p, player)
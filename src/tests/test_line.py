@@ -1,6 +1,8 @@
 import unittest
+import numpy as np
 
 from src.board import Vector, Line, Point
+from src.geometry import segment_distances
 
 
 class Test(unittest.TestCase):
@@ -40,3 +42,33 @@ class Test(unittest.TestCase):
         line = Line(Point(1, 1), Point(-1, 1))
         point = Point(0, 2)
         self.assertEqual(line.get_short_direction(point), Vector(0, -1))
+
+    def test_segment_distances(self):
+        rng = np.random.RandomState(0)
+        starts = rng.uniform(-1, 1, (3, 2))
+        ends = rng.uniform(-1, 1, (3, 4, 2))
+        ends[0, 0] = starts[0]
+        points = rng.uniform(-1, 1, (20, 2))
+
+        for include_start in (True, False):
+            for include_end in (True, False):
+                distances = segment_distances(
+                    starts[:, None, None, :],
+                    ends[:, :, None, :],
+                    points,
+                    include_start=include_start,
+                    include_end=include_end,
+                )
+                self.assertEqual(distances.shape, (3, 4, 20))
+
+                for i, start in enumerate(starts):
+                    for j, end in enumerate(ends[i]):
+                        line = Line(Point(*start), Point(*end))
+                        for k, point in enumerate(points):
+                            v = line.get_short_direction(
+                                Point(*point),
+                                include_start=include_start,
+                                include_end=include_end,
+                            )
+                            expected = np.inf if v is None else v.length()
+                            self.assertEqual(distances[i, j, k], expected)
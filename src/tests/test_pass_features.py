@@ -0,0 +1,35 @@
+import unittest
+from kaggle_environments.envs.football.helpers import Action
+
+from src.board import Board
+from src.pass_targeting import Target
+from src.pass_features import PassFeatures
+from src.tests.test_board import make_obs
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_pass_features.py
+    """
+
+    def test_can_pass(self):
+        for seed in range(20):
+            for shift in (-0.5, 0, 0.5):
+                board = Board(make_obs(shift=shift, seed=seed))
+                player = board.controlled_player
+                features = PassFeatures(board, player)
+
+                for p in board.my_team.values():
+                    if p == player:
+                        continue
+
+                    target = Target(board=board, player=player, target=p)
+                    self.assertEqual(
+                        features.can_pass(Action.HighPass, p), target.can_high_pass()
+                    )
+                    self.assertEqual(
+                        features.can_pass(Action.LongPass, p), target.can_long_pass()
+                    )
+                    self.assertEqual(
+                        features.can_pass(Action.ShortPass, p), target.can_short_pass()
+                    )
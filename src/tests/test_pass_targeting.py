@@ -0,0 +1,96 @@
+import unittest
+from kaggle_environments.envs.football.helpers import Action, PlayerRole
+
+from src import pass_targeting
+from src.board import (
+    Board,
+    default_decision_state,
+    load_decision_state,
+    save_decision_state,
+)
+from src.pass_targeting import Target, make_pass, make_shot, may_pass, may_shoot
+from src.pass_features import PassFeatures
+from src.tests.test_agent import played_boards
+from src.tests.test_board import make_obs
+
+
+def boards():
+    for seed in range(20):
+        for shift in (-0.5, 0, 0.5):
+            yield Board(make_obs(shift=shift, seed=seed))
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_pass_targeting.py
+    """
+
+    def test_score_bound(self):
+        for board in boards():
+            player = board.controlled_player
+            defence_x = max(
+                p.future_position(turns=5).x
+                for p in board.opponent_team.values()
+                if p.role != PlayerRole.GoalKeeper
+            )
+            for p in board.my_team.values():
+                target = Target(board=board, player=player, target=p)
+                self.assertLessEqual(target.score, target.score_bound(defence_x))
+
+    def test_may_shoot_and_pass(self):
+        self.addCleanup(load_decision_state, default_decision_state())
+
+        ruled_out = {"shot": 0, "pass": 0}  # with the commands make_shot and make_pass need
+        for board in played_boards():
+            player = board.controlled_player
+            state = save_decision_state()
+            if not may_shoot(board, player):
+                ruled_out["shot"] += board.command_count >= 1
+                self.assertIsNone(make_shot(board, player))
+            if not may_pass(board, player):
+                ruled_out["pass"] += board.command_count >= 2
+                self.assertIsNone(make_pass(board, player))
+            load_decision_state(state)
+
+        self.assertGreater(ruled_out["shot"], 0)
+        self.assertGreater(ruled_out["pass"], 0)
+
+    def test_find_best_pass(self):
+        find_best_pass = getattr(pass_targeting, "__find_best_pass")
+        for board in boards():
+            player = board.controlled_player
+            current = Target(board=board, player=player, target=player)
+            blocked_directions = current.blocked_directions(1)
+            targets = [
+                Target(board=board, player=player, target=p)
+                for p in board.my_team.values()
+                if p != player
+            ]
+
+            # all targets scored and sorted, as make_pass did it
+            features = PassFeatures(board, player)
+            pass_targets = [
+                (action, x)
+                for x in targets
+                if not (
+                    x.score < current.score * 1.1
+                    or x.pass_direction in blocked_directions
+                )
+                for action in (Action.HighPass, Action.LongPass, Action.ShortPass)
+                if features.can_pass(action, x.target)
+            ]
+            expected = None
+            if pass_targets:
+                expected = sorted(pass_targets, key=lambda t: -t[1].score)[0]
+
+            targets = [Target(board=board, player=player, target=x.target) for x in targets]
+            best = find_best_pass(board, player, targets, current.score, blocked_directions)
+            if expected is None:
+                self.assertIsNone(best)
+            else:
+                self.assertEqual(best[0], expected[0])
+                self.assertIs(best[1].target, expected[1].target)
+
+
+if __name__ == "__main__":
+    unittest.main()
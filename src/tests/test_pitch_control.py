@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+
+from src.board import Board, Point
+from src.pitch_control import pitch_control
+from src.tests.test_board import make_obs
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_pitch_control.py
+    """
+
+    def test_time(self):
+        board = Board(make_obs())
+        pc = pitch_control(board)
+        self.assertIs(pitch_control(board), pc)
+        self.assertEqual(pitch_control(board, resolution=0.05).resolution, 0.05)
+
+        for p in board.my_team.values():
+            # every player is at most half of a cell away from its cell center
+            self.assertLess(pc.time(p.position), pc.resolution / p.max_speed * 1.5)
+
+        point = Point(0.5, 0.3)
+        i, j = pc._cell(point)
+        cell = Point(pc.xs[i], pc.ys[j])
+        expected = min(
+            np.sqrt((cell.x - p.x) ** 2 + (cell.y - p.y) ** 2) / p.max_speed
+            for p in board.opponent_team.values()
+        )
+        self.assertGreaterEqual(pc.time(point, opponent=True), expected)
+        self.assertLessEqual(pc.time(point, opponent=True), expected * 2)
+        self.assertEqual(
+            pc.advantage(point), pc.time(point, opponent=True) - pc.time(point)
+        )
+
+    def test_update(self):
+        board = Board(make_obs(steps_left=3000))
+        pc = pitch_control(board)
+        board.update(make_obs(steps_left=2999, shift=0.1))
+        self.assertIsNot(pitch_control(board), pc)
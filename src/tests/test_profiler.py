@@ -0,0 +1,84 @@
+import unittest
+
+import agent as agent_module
+from src.board import default_decision_state, load_decision_state
+from src.geometry import Point, Vector
+from tools.observations import random_episode
+from tools.profiler import AllocationProfiler
+
+STEPS = 5
+
+
+def churn(obs):
+    vectors = [Vector(1, 0) for _ in range(4)]  # freed at the end of the step
+    return [len(vectors)]
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_profiler.py
+    """
+
+    def setUp(self):
+        agent_module._BOARD = None
+        load_decision_state(default_decision_state())
+        self.observations = [
+            {"players_raw": [obs]} for obs in random_episode(0, steps=STEPS)
+        ]
+
+    def tearDown(self):
+        agent_module._BOARD = None
+        load_decision_state(default_decision_state())
+
+    def test_created_objects(self):
+        with AllocationProfiler(agent=churn) as profiler:
+            for obs in self.observations:
+                self.assertEqual(profiler(obs), [4])
+            Vector(0, 1)  # outside of the steps
+
+        self.assertEqual([s.created_objects for s in profiler.steps], [4] * STEPS)
+        self.assertEqual(profiler.type_created, {"Vector": 4 * STEPS})
+
+        key = (churn.__code__.co_filename, churn.__code__.co_firstlineno + 1)
+        self.assertEqual(dict(profiler.line_created), {key: 4 * STEPS})
+        self.assertNotIn(key, profiler.line_blocks)  # none of them is retained
+        self.assertEqual(
+            profiler.line_created_sizes[key],
+            sum(s.created_size for s in profiler.steps),
+        )
+
+        # the constructors are restored
+        self.assertFalse(hasattr(Point.__init__, "__wrapped__"))
+
+    def test_agent(self):
+        with AllocationProfiler() as profiler:
+            for obs in self.observations:
+                profiler(obs)
+
+        self.assertEqual(len(profiler.steps), STEPS)
+        for s in profiler.steps:
+            self.assertGreater(s.created_objects, 0)
+            self.assertGreaterEqual(s.peak, s.retained_size)
+        self.assertEqual(
+            sum(profiler.line_created.values()),
+            sum(s.created_objects for s in profiler.steps),
+        )
+        self.assertEqual(
+            sum(profiler.line_sizes.values()),
+            sum(s.retained_size for s in profiler.steps),
+        )
+
+        rows = {
+            line.split()[0]: line.split()[1:]
+            for line in profiler.summary().splitlines()
+            if line
+        }
+        for mode in {s.game_mode for s in profiler.steps}:
+            steps = [s for s in profiler.steps if s.game_mode == mode]
+            self.assertEqual(int(rows[mode][0]), len(steps))
+            created = sum(s.created_objects for s in steps) / len(steps)
+            self.assertAlmostEqual(float(rows[mode][2]), created, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import numpy as np
+from kaggle_environments.envs.football.helpers import Action, PlayerRole
+
+from src.models import Player, Ball
+from src.geometry import Point, Vector
+from src.simulation import simulate_players, simulate_ball, stick_codes
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_simulation.py
+    """
+
+    def setUp(self):
+        self.player = Player(
+            id=0,
+            position=Point(0.1, 0.2),
+            vector=Vector(0.005, -0.002),
+            role=PlayerRole.CentralFront,
+        )
+
+    def _simulate(self, sticks, sprint):
+        positions = np.array([[self.player.x, self.player.y]])
+        vectors = np.array([[self.player.vector.x, self.player.vector.y]])
+        sticks = stick_codes(sticks).reshape(1, -1, 1)
+        return simulate_players(positions, vectors, sticks, sprint)
+
+    def test_apply(self):
+        for stick in (Action.Top, Action.BottomLeft, Action.Right, Action.ReleaseDirection):
+            for sprint in (True, False):
+                p = self.player.apply(stick, sprint)
+                positions, vectors = self._simulate([stick], sprint)
+                self.assertAlmostEqual(vectors[0, 1, 0, 0], p.vector.x)
+                self.assertAlmostEqual(vectors[0, 1, 0, 1], p.vector.y)
+                position = p.future_position(turns=1)
+                self.assertAlmostEqual(positions[0, 1, 0, 0], position.x)
+                self.assertAlmostEqual(positions[0, 1, 0, 1], position.y)
+
+    def test_sequence(self):
+        sticks = [Action.Top, Action.Top, None, Action.Left]
+        positions, vectors = self._simulate(sticks, True)
+
+        p = self.player
+        for t, stick in enumerate(sticks, start=1):
+            if stick:
+                p = p.apply(stick, True)
+            p = p.with_position(p.future_position(turns=1))
+            self.assertAlmostEqual(positions[0, t, 0, 0], p.x)
+            self.assertAlmostEqual(positions[0, t, 0, 1], p.y)
+
+    def test_no_stick(self):
+        positions, vectors = self._simulate([None] * 3, True)
+        self.assertAlmostEqual(positions[0, 3, 0, 0], self.player.future_position(3).x)
+        self.assertAlmostEqual(positions[0, 3, 0, 1], self.player.future_position(3).y)
+
+    def test_ball(self):
+        ball = Ball(
+            position=Point(0, 0),
+            vector=Vector(0.03, 0.0),
+            altitude=0.5,
+            vertical_speed=0.1,
+        )
+        trajectory = simulate_ball(ball, 100)
+        self.assertAlmostEqual(trajectory[2, 2], ball.future_altitude(2))
+        self.assertEqual(trajectory[-1, 2], 0)
+        self.assertAlmostEqual(trajectory[1, 0], 0.03 + ball.windage / 2)
+        # the ball stops and doesn't go back
+        self.assertTrue(np.all(np.diff(trajectory[:, 0]) >= 0))
+        self.assertAlmostEqual(trajectory[-1, 0], 0.03 ** 2 / -ball.windage / 2)
@@ -0,0 +1,98 @@
+import unittest
+import numpy as np
+from kaggle_environments.envs.football.helpers import PlayerRole
+
+from src.board import Board
+from src.geometry import Vector, angle_between_vectors, euclidean_distance
+from src.slide import DefenceSituation
+from src.tests.test_board import make_obs
+
+
+def defence_teammates(board):
+    controlled_player = board.controlled_player
+    goal_vector = Vector.from_point(
+        board.my_goal_position - controlled_player.future_position()
+    )
+    teammates = []
+    for p in board.my_team.values():
+        if (
+            p == controlled_player
+            or p.x > controlled_player.x
+            or p.role == PlayerRole.GoalKeeper
+        ):
+            continue
+
+        teammate_to_controlled = Vector.from_point(
+            controlled_player.future_position() - p.future_position()
+        )
+        if abs(angle_between_vectors(goal_vector, teammate_to_controlled)) < 30:
+            teammates.append(p)
+    return teammates
+
+
+def should_slide(board, intercept_time):
+    # the checks of slide.__should_slide before they moved to DefenceSituation
+    player, ball = board.controlled_player, board.ball
+    if (
+        player.yellow_card
+        or not ball.player
+        or player.speed < 0.009
+        or board.is_my_penalty_area(player.position)
+        or board.is_my_penalty_area(player.future_position())
+        or intercept_time < 20
+    ):
+        return False
+
+    teammates = defence_teammates(board)
+    if teammates:
+        return euclidean_distance(player.position, ball.position) < 0.025
+    return euclidean_distance(player.position, ball.player.position) < 0.025
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_slide.py
+    """
+
+    def test_defence_teammates(self):
+        for seed in range(20):
+            for shift in (-0.5, 0, 0.5):
+                obs = make_obs(shift=shift, seed=seed)
+                obs["ball_owned_team"] = 1
+                board = Board(obs)
+                situation = DefenceSituation(board)
+                self.assertEqual(situation.defence_teammates, defence_teammates(board))
+
+    def test_front_defence(self):
+        obs = make_obs(seed=0)
+        obs["ball_owned_team"] = 1
+        board = Board(obs)
+        situation = DefenceSituation(board)
+
+        intercept_vector = situation.ball_to_goal.get_short_direction(
+            board.controlled_player.future_position()
+        )
+        self.assertEqual(situation.intercept_vector, intercept_vector)
+        self.assertEqual(situation.intercept_distance, intercept_vector.length())
+
+    def test_should_slide(self):
+        slides = 0
+        for seed in range(20):
+            for shift in (-0.5, 0, 0.5):
+                obs = make_obs(shift=shift, seed=seed)
+                obs["ball_owned_team"] = 1
+                # the controlled player runs next to the ball owner
+                owner = obs["right_team"][obs["ball_owned_player"]]
+                obs["ball"] = [owner[0], owner[1], 0.11]
+                offset = 0.01 * (seed % 3)
+                obs["left_team"][obs["active"]] = [owner[0] + offset, owner[1]]
+                obs["left_team_direction"][obs["active"]] = [0.0, 0.01 * (seed % 2)]
+                obs["left_team_yellow_card"] = [seed == 7] * 11
+                board = Board(obs)
+                situation = DefenceSituation(board)
+                for intercept_time in (5, 20, np.inf):
+                    expected = should_slide(board, intercept_time)
+                    self.assertEqual(situation.should_slide(intercept_time), expected)
+                    slides += expected
+
+        self.assertGreater(slides, 0)
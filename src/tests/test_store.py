@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from agent import agent_step
+from src.board import Board
+from tools.observations import random_episode
+from tools.store import ObservationStore, fields, write
+
+
+def play(observations):
+    actions, state = [], None
+    for obs in observations:
+        action, state = agent_step(obs, state)
+        actions.append(action)
+    return actions
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_store.py
+    """
+
+    def setUp(self):
+        self.observations = list(random_episode(seed=3, steps=60))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "states")
+        count = write(self.path, ({"players_raw": [obs]} for obs in self.observations))
+        self.assertEqual(count, len(self.observations))
+        self.store = ObservationStore(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records(self):
+        self.assertEqual(len(self.store), len(self.observations))
+        self.assertEqual(self.store.fields, fields())
+        for obs, stored in zip(self.observations, self.store):
+            self.assertEqual(set(stored), set(fields()))
+            for name in stored:
+                self.assertEqual(stored[name], np.asarray(obs[name]).tolist(), name)
+
+        self.assertEqual(dict(self.store[-1]), dict(self.store[len(self.store) - 1]))
+        with self.assertRaises(IndexError):
+            self.store[len(self.store)]
+
+    def test_board(self):
+        for obs, stored in zip(self.observations, self.store):
+            expected, board = Board(obs), Board(stored)
+            for name in ("my", "opponent"):
+                for attr in ("positions", "vectors"):
+                    np.testing.assert_array_equal(
+                        getattr(board, f"{name}_{attr}"), getattr(expected, f"{name}_{attr}")
+                    )
+            self.assertEqual(board.ball.position, expected.ball.position)
+            self.assertEqual(board.ball.vector, expected.ball.vector)
+            self.assertEqual(board.ball.altitude, expected.ball.altitude)
+            self.assertEqual(board.game_mode, expected.game_mode)
+            self.assertEqual(board.controlled_player.id, expected.controlled_player.id)
+
+    def test_agent_actions(self):
+        self.assertEqual(
+            play(self.store.agent_inputs()),
+            play({"players_raw": [obs]} for obs in self.observations),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+import agent as agent_module
+from src.board import default_decision_state, load_decision_state
+from tools.trace import is_new_game, read_trace, record, replay, restore
+
+EPISODES = 2
+STEPS = 30
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_trace.py
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "game.trace")
+        record(cls.path, episodes=EPISODES, steps=STEPS)
+        cls.trace = list(read_trace(cls.path))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def tearDown(self):
+        agent_module._BOARD = None
+        load_decision_state(default_decision_state())
+
+    def test_read_trace(self):
+        self.assertEqual(len(self.trace), EPISODES * STEPS)
+        self.assertEqual(
+            [i for i in range(len(self.trace)) if is_new_game(self.trace, i)],
+            [e * STEPS for e in range(EPISODES)],
+        )
+        self.assertTrue(all(step.time > 0 for step in self.trace))
+
+    def test_replay(self):
+        # the trace start, the middle of the first game, the start of the second
+        for start in (0, STEPS // 2 + 3, STEPS):
+            for resync in (False, True):
+                result = replay(self.trace, start=start, resync=resync)
+                self.assertEqual(result.steps, list(range(start, len(self.trace))))
+                self.assertEqual(result.divergences, [], (start, resync))
+                self.assertEqual(
+                    result.actions, [step.action for step in self.trace[start:]]
+                )
+                self.assertIsNone(result.first_divergence)
+
+        result = replay(self.trace, start=5, stop=9)
+        self.assertEqual(result.steps, [5, 6, 7, 8])
+        self.assertEqual(len(result.times), len(result.recorded_times))
+
+    def test_restore(self):
+        for step in (0, 7, STEPS - 1, STEPS + 1):
+            restore(self.trace, step)
+            action = agent_module.agent(self.trace[step].obs)
+            self.assertEqual(action, self.trace[step].action)
+
+    def test_divergence(self):
+        trace = list(self.trace)
+        step = trace[10]
+        trace[10] = step._replace(action=[step.action[0] + 1])
+        result = replay(trace, start=4, resync=True)
+        self.assertEqual(result.divergences, [10])
+        self.assertEqual(result.first_divergence, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
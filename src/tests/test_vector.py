@@ -1,7 +1,7 @@
 import unittest
 import numpy as np
 
-from src.geometry import Vector, scalar_product, angle_between_vectors
+from src.geometry import Point, Vector, scalar_product, angle_between_vectors
 from kaggle_environments.envs.football.helpers import Action
 
 
@@ -10,6 +10,14 @@ class Test(unittest.TestCase):
     python3 -m unittest src/tests/test_vector.py
     """
 
+    def test_equality(self):
+        self.assertEqual(Vector(1, 2), Vector(1, 2))
+        self.assertEqual(Point(1, 2), Vector(1, 2))
+        self.assertNotEqual(Vector(1, 2), Vector(2, 1))
+        self.assertNotEqual(Point(1, 2), None)
+        self.assertNotEqual(Vector(1, 2), (1, 2))
+        self.assertEqual(len({Point(1, 2), Point(1, 2), Vector(0, 0)}), 2)
+
     def test_angle(self):
         self.assertEqual(Vector(1, 0).angle(), 0)
         self.assertEqual(Vector(0, 1).angle(), np.pi / 2)
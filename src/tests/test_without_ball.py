@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+
+from src import without_ball
+from src.board import Board
+from src.tests.test_board import make_obs
+
+find_opponent_intercept_time = getattr(without_ball, "__find_opponent_intercept_time")
+
+
+def opponent_intercept_time(board):
+    ball = board.ball
+    closed_opponent, intercept_time = None, np.inf
+    for p in board.opponent_team.values():
+        interval = ball.get_intercept_interval(board, p, height=p.height)
+        if interval and interval.lower() < intercept_time:
+            closed_opponent, intercept_time = p, interval.lower()
+    return closed_opponent, intercept_time
+
+
+class Test(unittest.TestCase):
+    """
+    python3 -m unittest src/tests/test_without_ball.py
+    """
+
+    def test_find_opponent_intercept_time(self):
+        rng = np.random.RandomState(0)
+        for seed in range(50):
+            obs = make_obs(shift=rng.uniform(-0.5, 0.5), seed=seed)
+            obs["ball_owned_team"] = -1
+            obs["ball_owned_player"] = -1
+            obs["ball"] = [rng.uniform(-0.9, 0.9), rng.uniform(-0.4, 0.4), 0.11]
+            obs["ball_direction"] = [*rng.normal(0, 0.02, 2), 0.0]
+            if seed % 10 == 0:
+                obs["ball_direction"] = [0.0, 0.0, 0.0]
+
+            board = Board(obs)
+            self.assertEqual(
+                find_opponent_intercept_time(board), opponent_intercept_time(board)
+            )
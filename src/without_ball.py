@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 from kaggle_environments.envs.football.helpers import Action
 
@@ -13,14 +14,19 @@ def without_ball_action(board: Board) -> Action:
     ball = board.ball
     player = board.controlled_player
 
-    my_intercept_interval = ball.get_intercept_interval(
-        board, player, height=player.height
-    )
-    height_interval = ball.height_interval(player.height)
+    race = board.ball_race
+    my_intercept_interval = race.interval(player)
+    height_interval = race.height_interval(player)
 
-    closed_opponent, opponent_intercept_time, opponent_intercept_interval = __find_opponent_intercept_interval(
-        board
-    )
+    closed_opponent, opponent_intercept_time = __find_opponent_intercept_time(board)
+    if logger.isEnabledFor(logging.DEBUG):
+        # informational only: the chase below doesn't depend on the teammates
+        teammate, teammate_time = race.first(opponent=False)
+        logger.debug(
+            f"Without ball action: first teammate = {teammate}, time = {teammate_time}, "
+            f"my time = {race.time(player)}, first opponent = {closed_opponent}, "
+            f"time = {opponent_intercept_time}."
+        )
 
     if not my_intercept_interval:
         if np.isfinite(opponent_intercept_time):
@@ -58,12 +64,13 @@ def without_ball_action(board: Board) -> Action:
         else:
             intercept_time = my_intercept_interval.lower()
 
-    logger.debug(
-        "Without ball action: "
-        f"intercept_time = {round(intercept_time, 1)}, "
-        f"my_intercept_interval = {my_intercept_interval}, "
-        f"opponent_intercept_interval = {opponent_intercept_interval}."
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Without ball action: "
+            f"intercept_time = {round(intercept_time, 1)}, "
+            f"my_intercept_interval = {my_intercept_interval}, "
+            f"opponent_intercept_interval = {__opponent_intercept_interval(board)}."
+        )
 
     intercept_position = ball.future_position(intercept_time)
     vector = Vector.from_point(intercept_position - player.position)
@@ -93,20 +100,23 @@ def without_ball_action(board: Board) -> Action:
     return board.set_action(action=None, vector=vector, sprint=speed)
 
 
-def __find_opponent_intercept_interval(board: Board):
-    ball = board.ball
+def __find_opponent_intercept_time(board: Board):
+    """
+    The first opponent at the ball and his intercept time.
+    Equal times go to the first opponent of the team.
+
+    Only the opponents whose lower bound can beat the best time are solved exactly, see BallRace.first.
+    """
+    return board.ball_race.first(opponent=True)
+
+
+def __opponent_intercept_interval(board: Board) -> Interval:
+    race = board.ball_race
 
     opponent_intercept_interval = Interval()
-    closed_opponent, opponent_intercept_time = None, np.inf
     for p in board.opponent_team.values():
-        interval = ball.get_intercept_interval(board, p, height=p.height)
-        if interval:
-            if interval.lower() < opponent_intercept_time:
-                opponent_intercept_time = interval.lower()
-                closed_opponent = p
-            opponent_intercept_interval |= interval
-
-    return closed_opponent, opponent_intercept_time, opponent_intercept_interval
+        opponent_intercept_interval |= race.interval(p)
+    return opponent_intercept_interval
 
 
 def __press_opponent(board, player, opponent):
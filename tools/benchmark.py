@@ -0,0 +1,259 @@
+"""
+Micro-benchmarks of the geometric kernels.
+
+    python -m tools.benchmark                 # compare with the stored baseline
+    python -m tools.benchmark --save          # store new baseline
+    python -m tools.benchmark -k interval     # only benchmarks with 'interval' in the name
+
+Timings depend on the machine, save your own baseline before the change you want to check.
+"""
+import os
+import sys
+import json
+import timeit
+import logging
+import argparse
+import numpy as np
+from typing import Callable, Dict, List
+
+from src.board import Board
+from src.logger import logger
+from src.portion import Interval
+from src.geometry import Point, Vector, Line
+from src.models import (
+    Ball,
+    speed_interval,
+    field_interval,
+    field_times,
+    first_intercept_time,
+)
+from src.pass_targeting import Target
+from tools.observations import random_episode
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.2
+
+BENCHMARKS: Dict[str, Callable[[], Callable]] = {}
+
+
+def benchmark(name: str):
+    """
+    Register a benchmark, the decorated function prepares data and returns the callable to time.
+    """
+
+    def wrapper(f):
+        BENCHMARKS[name] = f
+        return f
+
+    return wrapper
+
+
+def _observation(step=100):
+    for i, obs in enumerate(random_episode(seed=0)):
+        if i == step:
+            return obs
+
+
+def _board():
+    return Board(_observation())
+
+
+@benchmark("interval_init")
+def _interval_init():
+    return lambda: Interval((0, 1), (0.5, 2), (3, 4))
+
+
+@benchmark("interval_and")
+def _interval_and():
+    i1, i2 = Interval((0, 1), (2, 5)), Interval((0.5, 3), (4, 10))
+    return lambda: i1 & i2
+
+
+@benchmark("interval_or")
+def _interval_or():
+    i1, i2 = Interval((0, 1), (2, 5)), Interval((0.5, 3), (4, 10))
+    return lambda: i1 | i2
+
+
+@benchmark("interval_sub")
+def _interval_sub():
+    i1, i2 = Interval((0, 1), (2, 5)), Interval((0.5, 3), (4, 10))
+    return lambda: i1 - i2
+
+
+@benchmark("interval_neg")
+def _interval_neg():
+    i = Interval((0, 1), (2, 5))
+    return lambda: -i
+
+
+@benchmark("speed_interval_naive")
+def _speed_interval_naive():
+    board = _board()
+    player = board.controlled_player
+    opponents = list(board.opponent_team.values())
+    return lambda: speed_interval(player.position, player.vector, opponent=opponents)
+
+
+@benchmark("speed_interval_windage")
+def _speed_interval_windage():
+    board = _board()
+    position, vector = Point(0, 0), Vector(0.03, 0.01)
+    opponents = list(board.opponent_team.values())
+    return lambda: speed_interval(
+        position, vector, opponent=opponents, acceleration=Ball.windage
+    )
+
+
+@benchmark("first_intercept_time_naive")
+def _first_intercept_time_naive():
+    board = _board()
+    player = board.controlled_player
+    opponents = list(board.opponent_team.values())
+    return lambda: first_intercept_time(player.position, player.vector, opponents)
+
+
+@benchmark("first_intercept_time_windage")
+def _first_intercept_time_windage():
+    board = _board()
+    position, vector = Point(0, 0), Vector(0.03, 0.01)
+    opponents = list(board.opponent_team.values())
+    return lambda: first_intercept_time(
+        position, vector, opponents, acceleration=Ball.windage
+    )
+
+
+@benchmark("field_interval")
+def _field_interval():
+    board = _board()
+    position, vector = Point(0.2, 0.1), Vector(0.01, -0.005)
+    return lambda: field_interval(position, vector, board)
+
+
+@benchmark("field_times_16")
+def _field_times_16():
+    board = _board()
+    position = [0.2, 0.1]
+    vectors = np.random.RandomState(0).normal(0, 0.01, (16, 2))
+    return lambda: field_times(position, vectors, board)
+
+
+@benchmark("field_border_distance")
+def _field_border_distance():
+    field = Board.field
+    point = Point(0.7, -0.3)
+    return lambda: field.border_distance(point)
+
+
+@benchmark("goal_post_angles")
+def _goal_post_angles():
+    point = Point(0.6, 0.1)
+    return lambda: Board.goal_visibility.post_angles(point)
+
+
+@benchmark("line_get_short_direction")
+def _line_get_short_direction():
+    line = Line(Point(0, 0), Point(0.3, 0.1))
+    point = Point(0.1, 0.2)
+    return lambda: line.get_short_direction(
+        point, include_start=False, include_end=False
+    )
+
+
+@benchmark("line_get_short_direction_infinity")
+def _line_get_short_direction_infinity():
+    line = Line(Point(0, 0), Point(0.3, 0.1))
+    point = Point(0.4, 0.2)
+    return lambda: line.get_short_direction(point, infinity_line=True)
+
+
+@benchmark("target_init")
+def _target_init():
+    board = _board()
+    player = board.controlled_player
+    target = next(p for p in board.my_team.values() if p != player)
+    # the scoring is lazy, it's forced to time the same work as the eager init did
+    return lambda: Target(board=board, player=player, target=target).score
+
+
+@benchmark("board_init")
+def _board_init():
+    obs = _observation()
+    return lambda: Board(obs)
+
+
+@benchmark("board_update")
+def _board_update():
+    obs = _observation()
+    board = Board(obs)
+    return lambda: board.update(obs)
+
+
+def run(names: List[str], repeat: int = 5) -> Dict[str, float]:
+    """
+    Best time of one call in seconds for every benchmark.
+    """
+    results = {}
+    for name in names:
+        timer = timeit.Timer(BENCHMARKS[name]())
+        number, _ = timer.autorange()
+        results[name] = min(timer.repeat(repeat=repeat, number=number)) / number
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float):
+    """
+    Names of the benchmarks which are slower than the baseline by more than the threshold.
+    """
+    return [
+        name
+        for name, t in results.items()
+        if name in baseline and t > baseline[name] * (1 + threshold)
+    ]
+
+
+def main(flags):
+    logger.setLevel(logging.WARNING)
+
+    names = [n for n in BENCHMARKS if not flags.k or flags.k in n]
+    results = run(names, repeat=flags.repeat)
+
+    baseline = {}
+    if os.path.exists(flags.baseline):
+        with open(flags.baseline, "r") as f:
+            baseline = json.load(f)
+
+    regressions = compare(results, baseline, flags.threshold)
+
+    print(f"{'benchmark':<36}{'baseline, us':>14}{'current, us':>14}{'ratio':>8}")
+    for name, t in results.items():
+        b = baseline.get(name)
+        line = f"{name:<36}{b * 1e6 if b else float('nan'):>14.2f}{t * 1e6:>14.2f}"
+        line += f"{t / b if b else float('nan'):>8.2f}"
+        if name in regressions:
+            line += "  REGRESSION"
+        print(line)
+
+    if flags.save:
+        baseline.update(results)
+        with open(flags.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to '{flags.baseline}'.")
+        return 0
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-k", help="run benchmarks with this substring in the name")
+    parser.add_argument("--save", action="store_true", help="save results as baseline")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline json file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown, 0.2 means 20%%",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,122 @@
+import numpy as np
+
+ROLES = [0, 1, 2, 2, 3, 4, 5, 6, 6, 7, 9]
+SET_PIECES = [2, 3, 4, 5, 6]  # GoalKick, FreeKick, Corner, ThrowIn, Penalty
+
+
+def random_episode(seed: int = 0, steps: int = 300):
+    """
+    Synthetic observations (players_raw[0] format) of one episode.
+
+    Players move smoothly, the ball is owned by a random player or flies freely,
+    game modes and sticky actions change from time to time.
+    Good enough for benchmarks and replays, not for the training.
+    """
+    rng = np.random.RandomState(seed)
+
+    positions = {
+        side: np.c_[rng.uniform(-1, 1, 11), rng.uniform(-0.42, 0.42, 11)]
+        for side in ("left", "right")
+    }
+    positions["left"][0] = [-0.99, 0]
+    positions["right"][0] = [0.99, 0]
+    vectors = {side: rng.normal(0, 0.006, (11, 2)) for side in positions}
+
+    ball = np.array([0.0, 0.0, 0.11])
+    ball_direction = np.zeros(3)
+    owner = (-1, -1)
+    score = [0, 0]
+    game_mode, game_mode_steps = 0, 0
+    sticky_actions = [0] * 10
+
+    for step in range(steps):
+        for side in positions:
+            v = vectors[side] + rng.normal(0, 0.003, (11, 2))
+            speed = np.linalg.norm(v, axis=1, keepdims=True)
+            v = np.where(speed > 0.015, v / np.maximum(speed, 1e-9) * 0.015, v)
+            if rng.rand() < 0.05:
+                v[rng.randint(11)] = 0
+            vectors[side] = v
+
+            p = positions[side] + v
+            p[:, 0] = np.clip(p[:, 0], -1.05, 1.05)
+            p[:, 1] = np.clip(p[:, 1], -0.45, 0.45)
+            positions[side] = p
+
+        r = rng.rand()
+        if owner[0] == -1:
+            if r < 0.1:
+                owner = (int(rng.randint(2)), int(rng.randint(11)))
+        elif r < 0.08:
+            owner = (-1, -1)
+            ball_direction = np.array(
+                [
+                    rng.normal(0, 0.03),
+                    rng.normal(0, 0.02),
+                    max(0, rng.normal(0, 0.03)),
+                ]
+            )
+
+        if owner[0] >= 0:
+            side = "left" if owner[0] == 0 else "right"
+            ball = np.array([*positions[side][owner[1]], 0.11])
+            ball_direction = np.array([*vectors[side][owner[1]], 0.0])
+        else:
+            ball = ball + ball_direction
+            ball_direction = ball_direction * 0.98
+            ball_direction[2] -= 0.098 * 0.1
+            if ball[2] < 0.11:
+                ball[2] = 0.11
+                if abs(ball_direction[2]) > 0.01:
+                    ball_direction[2] = -ball_direction[2] * 0.5
+                else:
+                    ball_direction[2] = 0.0
+            ball[0] = np.clip(ball[0], -1.02, 1.02)
+            ball[1] = np.clip(ball[1], -0.43, 0.43)
+
+        if game_mode_steps > 0:
+            game_mode_steps -= 1
+            if game_mode_steps == 0:
+                game_mode = 0
+        elif rng.rand() < 0.03:
+            game_mode = int(rng.choice(SET_PIECES))
+            game_mode_steps = int(rng.randint(3, 15))
+
+        if rng.rand() < 0.004:
+            score[rng.randint(2)] += 1
+
+        active = int(np.argmin(np.linalg.norm(positions["left"] - ball[:2], axis=1)))
+        if rng.rand() < 0.2:
+            sticky_actions = [int(rng.rand() < 0.15) for _ in range(10)]
+
+        obs = {
+            "ball": ball.tolist(),
+            "ball_direction": ball_direction.tolist(),
+            "ball_rotation": [0.0, 0.0, 0.0],
+            "ball_owned_team": owner[0],
+            "ball_owned_player": owner[1],
+            "game_mode": game_mode,
+            "score": list(score),
+            "steps_left": 3000 - step,
+            "active": active,
+            "designated": active,
+            "sticky_actions": list(sticky_actions),
+        }
+        for side in positions:
+            obs[f"{side}_team"] = positions[side].tolist()
+            obs[f"{side}_team_direction"] = vectors[side].tolist()
+            obs[f"{side}_team_roles"] = list(ROLES)
+            obs[f"{side}_team_tired_factor"] = [0.0] * 11
+            obs[f"{side}_team_active"] = [True] * 11
+            obs[f"{side}_team_yellow_card"] = [False] * 11
+
+        yield obs
+
+
+def random_observations(num_episodes: int = 1, steps: int = 300):
+    """
+    Agent inputs, {"players_raw": [obs]}, of several synthetic episodes.
+    """
+    for seed in range(num_episodes):
+        for obs in random_episode(seed, steps):
+            yield {"players_raw": [obs]}
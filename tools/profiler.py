@@ -0,0 +1,271 @@
+"""
+Allocation profile of the agent.
+
+    python -m tools.profiler --episodes 2
+    python -m tools.profiler --steps 100 --top 20
+
+Every step runs with tracemalloc tracing. Blocks allocated in the step and still
+alive at its end ("retained") are attributed to the source lines of src/.
+
+tracemalloc can't count blocks freed inside the step, so the churn of the temporary
+geometry objects is counted by the constructors of CHURN_CLASSES instead: every object
+created in the step ("created"), freed or not, with the size of the instance and its
+__dict__, attributed to the calling line. Temporary dicts, lists and tuples have no
+constructor to hook, they show up only in the peak of the traced memory and in the GC
+collections of every generation, counted per step.
+Tracing slows the agent down several times, don't compare the timings with normal runs.
+"""
+import os
+import gc
+import sys
+import time
+import logging
+import argparse
+import functools
+import linecache
+import tracemalloc
+from collections import Counter, defaultdict
+from typing import Callable, List, NamedTuple, Tuple
+from kaggle_environments.envs.football.helpers import GameMode
+
+import agent as agent_module
+from src.board import default_decision_state, load_decision_state
+from src.geometry import Point
+from src.logger import logger
+from src.models import Ball, Kinematics, Player
+from src.portion import Interval
+from tools.observations import random_episode
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+# their constructors are counted, Vector is counted by the constructor of Point
+CHURN_CLASSES = (Point, Interval, Kinematics, Player, Ball)
+
+
+class StepProfile(NamedTuple):
+    step: int
+    game_mode: str
+    time: float  # seconds
+    retained_blocks: int  # blocks allocated in src/ during the step and alive at its end
+    retained_size: int  # their size, bytes
+    created_objects: int  # objects of CHURN_CLASSES created during the step
+    created_size: int  # their size, bytes
+    peak: int  # peak of the memory allocated during the step, bytes
+    gc_collections: Tuple[int, ...]  # per generation
+
+
+class AllocationProfiler:
+    """
+    Wrapper around the agent function which profiles the allocations of every step.
+
+    Tracing and the constructor hooks are on inside the with block only.
+    """
+
+    def __init__(self, agent: Callable = None, frames: int = 1, classes=CHURN_CLASSES):
+        self.agent = agent or agent_module.agent
+        self.frames = frames
+        self.classes = classes
+        self.steps: List[StepProfile] = []
+        self.line_blocks = Counter()  # (file name, line number) -> retained blocks
+        self.line_sizes = Counter()  # (file name, line number) -> retained bytes
+        self.line_created = Counter()  # (file name, line number) -> created objects
+        self.line_created_sizes = Counter()  # (file name, line number) -> created bytes
+        self.type_created = Counter()  # class name -> created objects
+
+        self._counting = False
+        self._step_created = [0, 0]  # objects, bytes
+        self._constructing = []  # objects in their constructors, innermost last
+        self._inits = {}  # class -> original __init__
+
+    def __enter__(self):
+        for cls in self.classes:
+            self._inits[cls] = cls.__dict__["__init__"]
+            cls.__init__ = self._counted(cls.__init__)
+        tracemalloc.start(self.frames)
+        return self
+
+    def __exit__(self, *args):
+        tracemalloc.stop()
+        for cls, init in self._inits.items():
+            cls.__init__ = init
+        self._inits.clear()
+
+    def reset(self):
+        self.steps = []
+        self.line_blocks.clear()
+        self.line_sizes.clear()
+        self.line_created.clear()
+        self.line_created_sizes.clear()
+        self.type_created.clear()
+
+    def _counted(self, init):
+        @functools.wraps(init)
+        def wrapper(obj, *args, **kwargs):
+            # super().__init__ of a counted class runs for the same object
+            outer = not self._constructing or self._constructing[-1] is not obj
+            self._constructing.append(obj)
+            try:
+                init(obj, *args, **kwargs)
+            finally:
+                self._constructing.pop()
+
+            if outer and self._counting:
+                frame = sys._getframe(1)
+                key = (frame.f_code.co_filename, frame.f_lineno)
+                size = sys.getsizeof(obj) + sys.getsizeof(getattr(obj, "__dict__", {}))
+                self.line_created[key] += 1
+                self.line_created_sizes[key] += size
+                self.type_created[type(obj).__name__] += 1
+                self._step_created[0] += 1
+                self._step_created[1] += size
+
+        return wrapper
+
+    def __call__(self, obs):
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("Use the profiler inside the with block.")
+
+        raw = obs["players_raw"][0]
+        collections = [s["collections"] for s in gc.get_stats()]
+
+        # forget the older blocks, the peak starts from zero too
+        tracemalloc.clear_traces()
+        self._step_created = [0, 0]
+        self._counting = True
+        start = time.perf_counter()
+        try:
+            action = self.agent(obs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._counting = False
+        _, peak = tracemalloc.get_traced_memory()
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(True, os.path.join(SRC_DIR, "*"))]
+        )
+        blocks, size = 0, 0
+        for stat in snapshot.statistics("lineno"):
+            frame = stat.traceback[0]
+            key = (frame.filename, frame.lineno)
+            self.line_blocks[key] += stat.count
+            self.line_sizes[key] += stat.size
+            blocks += stat.count
+            size += stat.size
+
+        self.steps.append(
+            StepProfile(
+                step=3001 - raw["steps_left"],
+                game_mode=GameMode(raw["game_mode"]).name,
+                time=elapsed,
+                retained_blocks=blocks,
+                retained_size=size,
+                created_objects=self._step_created[0],
+                created_size=self._step_created[1],
+                peak=peak,
+                gc_collections=tuple(
+                    s["collections"] - c for s, c in zip(gc.get_stats(), collections)
+                ),
+            )
+        )
+        return action
+
+    def summary(self, top: int = 10) -> str:
+        """
+        Tables by game mode, by module and by source line, then the created objects
+        by class and by source line.
+        """
+        if not self.steps:
+            return "No steps."
+
+        by_mode = defaultdict(list)
+        for s in self.steps:
+            by_mode[s.game_mode].append(s)
+
+        lines = [
+            f"{'game mode':<12}{'steps':>7}{'ms/step':>9}{'created/step':>14}"
+            f"{'created KB/step':>17}{'retained blocks/step':>22}"
+            f"{'retained KB/step':>18}{'peak KB':>9}{'gc0':>6}{'gc1':>6}{'gc2':>6}"
+        ]
+        for mode, steps in sorted(by_mode.items(), key=lambda x: -len(x[1])):
+            n = len(steps)
+            gcs = [sum(s.gc_collections[i] for s in steps) for i in range(3)]
+            lines.append(
+                f"{mode:<12}{n:>7}{sum(s.time for s in steps) / n * 1000:>9.2f}"
+                f"{sum(s.created_objects for s in steps) / n:>14.1f}"
+                f"{sum(s.created_size for s in steps) / n / 1024:>17.2f}"
+                f"{sum(s.retained_blocks for s in steps) / n:>22.1f}"
+                f"{sum(s.retained_size for s in steps) / n / 1024:>18.2f}"
+                f"{max(s.peak for s in steps) / 1024:>9.1f}"
+                + "".join(f"{c:>6}" for c in gcs)
+            )
+
+        module_sizes, module_blocks = Counter(), Counter()
+        for (file_name, _), size in self.line_sizes.items():
+            module = os.path.relpath(file_name, SRC_DIR)
+            module_sizes[module] += size
+            module_blocks[module] += self.line_blocks[(file_name, _)]
+
+        total = sum(module_sizes.values()) or 1
+        lines.append("")
+        lines.append(f"{'module':<24}{'retained blocks':>17}{'retained KB':>13}{'share':>8}")
+        for module, size in module_sizes.most_common():
+            lines.append(
+                f"{module:<24}{module_blocks[module]:>17}{size / 1024:>13.1f}"
+                f"{size / total * 100:>7.1f}%"
+            )
+
+        lines.append("")
+        lines.append(f"{'line':<32}{'retained blocks':>17}{'retained KB':>13}  source")
+        for (file_name, lineno), size in self.line_sizes.most_common(top):
+            location = f"{os.path.relpath(file_name, SRC_DIR)}:{lineno}"
+            source = linecache.getline(file_name, lineno).strip()
+            lines.append(
+                f"{location:<32}{self.line_blocks[(file_name, lineno)]:>17}"
+                f"{size / 1024:>13.1f}  {source}"
+            )
+
+        lines.append("")
+        lines.append(f"{'class':<24}{'created':>17}")
+        for name, count in self.type_created.most_common():
+            lines.append(f"{name:<24}{count:>17}")
+
+        lines.append("")
+        lines.append(f"{'line':<32}{'created':>17}{'created KB':>13}  source")
+        for (file_name, lineno), count in self.line_created.most_common(top):
+            location = f"{os.path.relpath(file_name, ROOT_DIR)}:{lineno}"
+            source = linecache.getline(file_name, lineno).strip()
+            size = self.line_created_sizes[(file_name, lineno)]
+            lines.append(f"{location:<32}{count:>17}{size / 1024:>13.1f}  {source}")
+
+        return "\n".join(lines)
+
+
+def main(flags):
+    logger.setLevel(logging.WARNING)
+
+    with AllocationProfiler(frames=flags.frames) as profiler:
+        for seed in range(flags.episodes):
+            # a new game
+            agent_module._BOARD = None
+            load_decision_state(default_decision_state())
+            profiler.reset()
+
+            for obs in random_episode(seed, flags.steps):
+                profiler({"players_raw": [obs]})
+
+            print(f"Episode {seed}:")
+            print(profiler.summary(top=flags.top))
+            print()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--episodes", type=int, default=1)
+    parser.add_argument("--steps", type=int, default=300)
+    parser.add_argument("--top", type=int, default=10, help="number of source lines")
+    parser.add_argument(
+        "--frames", type=int, default=1, help="traceback depth of tracemalloc"
+    )
+    sys.exit(main(parser.parse_args()))
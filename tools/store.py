@@ -0,0 +1,211 @@
+"""
+Columnar on-disk store of observations.
+
+    python -m tools.store write states/ --episodes 100
+    python -m tools.store write states/ --trace game.trace
+
+Every field Board consumes is kept in its own raw binary file with a fixed dtype,
+meta.json keeps the number of records, dtypes and shapes. Files are opened with
+numpy.memmap, so readers start instantly and share pages between processes.
+"""
+import os
+import sys
+import json
+import argparse
+import numpy as np
+from collections.abc import Mapping
+from typing import Dict, Iterable, Tuple
+
+from tools.observations import random_observations
+
+META_FILE = "meta.json"
+NUM_PLAYERS = 11
+
+
+def fields(num_players: int = NUM_PLAYERS, float_dtype: str = "float64") -> Dict[str, Tuple[str, tuple]]:
+    """
+    Field name -> (dtype, shape of one record).
+    """
+    out = {}
+    for side in ("left", "right"):
+        out[f"{side}_team"] = (float_dtype, (num_players, 2))
+        out[f"{side}_team_direction"] = (float_dtype, (num_players, 2))
+        out[f"{side}_team_roles"] = ("int8", (num_players,))
+        out[f"{side}_team_tired_factor"] = (float_dtype, (num_players,))
+        out[f"{side}_team_active"] = ("bool", (num_players,))
+        out[f"{side}_team_yellow_card"] = ("bool", (num_players,))
+
+    out["ball"] = (float_dtype, (3,))
+    out["ball_direction"] = (float_dtype, (3,))
+    out["ball_owned_team"] = ("int8", ())
+    out["ball_owned_player"] = ("int8", ())
+    out["game_mode"] = ("int8", ())
+    out["score"] = ("int16", (2,))
+    out["steps_left"] = ("int16", ())
+    out["active"] = ("int8", ())
+    out["sticky_actions"] = ("int8", (10,))
+    return out
+
+
+class ObservationWriter:
+    """
+    Append observations (players_raw[0] format) to the store directory.
+    """
+
+    def __init__(self, path: str, float_dtype: str = "float64"):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.fields = fields(float_dtype=float_dtype)
+        self.count = 0
+        self._files = {
+            name: open(os.path.join(path, f"{name}.bin"), "wb") for name in self.fields
+        }
+
+    def append(self, obs):
+        for name, (dtype, shape) in self.fields.items():
+            value = np.asarray(obs[name], dtype=dtype)
+            if value.shape != shape:
+                raise ValueError(
+                    f"Field '{name}' has shape {value.shape}, expected {shape}."
+                )
+            self._files[name].write(value.tobytes())
+        self.count += 1
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+        meta = dict(
+            count=self.count,
+            fields={
+                name: dict(dtype=dtype, shape=list(shape))
+                for name, (dtype, shape) in self.fields.items()
+            },
+        )
+        with open(os.path.join(self.path, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class LazyObservation(Mapping):
+    """
+    One record of the store in players_raw[0] format, fields are read on first access.
+    """
+
+    def __init__(self, store: "ObservationStore", index: int):
+        self._store = store
+        self._index = index
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            # python lists and scalars, as in the observations of the environment
+            self._values[key] = self._store.column(key)[self._index].tolist()
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._store.fields)
+
+    def __len__(self):
+        return len(self._store.fields)
+
+
+class ObservationStore:
+    """
+    Read-only view of the store directory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, META_FILE), "r") as f:
+            meta = json.load(f)
+
+        self.count = meta["count"]
+        self.fields = {
+            name: (v["dtype"], tuple(v["shape"])) for name, v in meta["fields"].items()
+        }
+        self._columns = {}
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        All records of the field as (count, *shape) memory-mapped array.
+        """
+        if name not in self._columns:
+            if name not in self.fields:
+                raise KeyError(name)
+
+            dtype, shape = self.fields[name]
+            if self.count:
+                self._columns[name] = np.memmap(
+                    os.path.join(self.path, f"{name}.bin"),
+                    dtype=dtype,
+                    mode="r",
+                    shape=(self.count, *shape),
+                )
+            else:
+                self._columns[name] = np.empty((0, *shape), dtype=dtype)
+        return self._columns[name]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index: int) -> LazyObservation:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return LazyObservation(self, index)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield LazyObservation(self, i)
+
+    def agent_inputs(self):
+        """
+        Records in the format of the agent function input.
+        """
+        for obs in self:
+            yield {"players_raw": [obs]}
+
+
+def write(path: str, observations: Iterable[dict], float_dtype: str = "float64") -> int:
+    with ObservationWriter(path, float_dtype=float_dtype) as writer:
+        for obs in observations:
+            writer.append(obs["players_raw"][0])
+    return writer.count
+
+
+def main(flags):
+    if flags.trace:
+        from tools.trace import read_trace
+
+        observations = (step.obs for step in read_trace(flags.trace))
+    else:
+        observations = random_observations(flags.episodes, flags.steps)
+
+    count = write(flags.path, observations, float_dtype=flags.float_dtype)
+    print(f"{count} observations saved to '{flags.path}'.")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    write_parser = subparsers.add_parser("write", help="write observations to the store")
+    write_parser.add_argument("path")
+    write_parser.add_argument("--trace", help="take observations from the trace file")
+    write_parser.add_argument("--episodes", type=int, default=1)
+    write_parser.add_argument("--steps", type=int, default=300)
+    write_parser.add_argument(
+        "--float-dtype",
+        default="float64",
+        help="float32 halves the size, but replays are no longer bit-exact",
+    )
+
+    sys.exit(main(parser.parse_args()))
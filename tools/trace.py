@@ -0,0 +1,220 @@
+"""
+Record the agent's decisions and replay them.
+
+    python -m tools.trace record game.trace --episodes 5
+    python -m tools.trace replay game.trace
+    python -m tools.trace replay game.trace --start 120 --resync
+
+A trace is a gzip stream of pickled TraceStep records. Replay checks that the agent
+returns the same actions and compares the step times with the recorded ones.
+"""
+import sys
+import gzip
+import time
+import pickle
+import logging
+import argparse
+import numpy as np
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+import agent as agent_module
+from src.board import (
+    Board,
+    default_decision_state,
+    save_decision_state,
+    load_decision_state,
+)
+from src.logger import logger
+from tools.observations import random_episode
+
+
+class TraceStep(NamedTuple):
+    obs: dict
+    action: list
+    state: dict  # decision state before the step
+    time: float  # seconds
+
+
+class TraceRecorder:
+    """
+    Wrapper around the agent function which writes every step to the trace file.
+    """
+
+    def __init__(self, path: str, agent: Callable = None):
+        self.path = path
+        self.agent = agent or agent_module.agent
+        self._file = gzip.open(path, "wb")
+
+    def __call__(self, obs):
+        state = save_decision_state()
+        start = time.perf_counter()
+        action = self.agent(obs)
+        elapsed = time.perf_counter() - start
+        pickle.dump(
+            TraceStep(obs=obs, action=action, state=state, time=elapsed),
+            self._file,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        return action
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def read_trace(path: str) -> Iterator[TraceStep]:
+    with gzip.open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def record(path: str, episodes: int = 1, steps: int = 300):
+    """
+    Trace of the agent playing synthetic episodes, every one as a new game.
+    """
+    with TraceRecorder(path) as recorder:
+        for seed in range(episodes):
+            agent_module._BOARD = None
+            load_decision_state(default_decision_state())
+            for obs in random_episode(seed, steps):
+                recorder({"players_raw": [obs]})
+
+
+def is_new_game(trace: List[TraceStep], step: int) -> bool:
+    """
+    True if the step starts a game: the steps left don't decrease from the last step.
+    """
+    if step == 0:
+        return True
+    steps_left = trace[step].obs["players_raw"][0]["steps_left"]
+    return steps_left >= trace[step - 1].obs["players_raw"][0]["steps_left"]
+
+
+def restore(trace: List[TraceStep], step: int):
+    """
+    Put the agent in the state it had right before the step.
+    """
+    if is_new_game(trace, step):
+        agent_module._BOARD = None
+    else:
+        # previous board for the incremental update
+        agent_module._BOARD = Board(trace[step - 1].obs["players_raw"][0])
+    load_decision_state(trace[step].state)
+
+
+class ReplayResult(NamedTuple):
+    steps: List[int]
+    actions: List[list]
+    divergences: List[int]
+    times: np.ndarray
+    recorded_times: np.ndarray
+
+    @property
+    def first_divergence(self) -> Optional[int]:
+        return self.divergences[0] if self.divergences else None
+
+
+def replay(
+    trace: List[TraceStep],
+    start: int = 0,
+    stop: Optional[int] = None,
+    resync: bool = False,
+) -> ReplayResult:
+    """
+    Feed the trace to the agent starting from the step.
+
+    With resync the recorded decision state is restored before every step,
+    so every divergence is independent of the previous ones. A new game in the trace
+    starts from a new board and the default decision state.
+    """
+    stop = len(trace) if stop is None else min(stop, len(trace))
+    restore(trace, start)
+
+    steps, actions, divergences, times = [], [], [], []
+    for i in range(start, stop):
+        step = trace[i]
+        if i > start and is_new_game(trace, i):
+            agent_module._BOARD = None
+            load_decision_state(default_decision_state())
+        if resync:
+            load_decision_state(step.state)
+
+        t = time.perf_counter()
+        action = agent_module.agent(step.obs)
+        times.append(time.perf_counter() - t)
+
+        steps.append(i)
+        actions.append(action)
+        if action != step.action:
+            divergences.append(i)
+
+    return ReplayResult(
+        steps=steps,
+        actions=actions,
+        divergences=divergences,
+        times=np.array(times),
+        recorded_times=np.array([trace[i].time for i in steps]),
+    )
+
+
+def _time_summary(times: np.ndarray) -> str:
+    ms = times * 1000
+    return (
+        f"mean={ms.mean():.2f}ms, p50={np.percentile(ms, 50):.2f}ms, "
+        f"p95={np.percentile(ms, 95):.2f}ms, max={ms.max():.2f}ms"
+    )
+
+
+def main(flags):
+    logger.setLevel(logging.WARNING)
+
+    if flags.command == "record":
+        record(flags.path, flags.episodes, flags.steps)
+        print(f"Trace saved to '{flags.path}'.")
+        return 0
+
+    trace = list(read_trace(flags.path))
+    result = replay(trace, start=flags.start, stop=flags.stop, resync=flags.resync)
+
+    print(f"Steps: {len(result.steps)}, divergences: {len(result.divergences)}.")
+    if result.divergences:
+        i = result.first_divergence
+        print(
+            f"First divergence at step {i}: recorded {trace[i].action}, "
+            f"replayed {result.actions[result.steps.index(i)]}."
+        )
+    print(f"Recorded: {_time_summary(result.recorded_times)}.")
+    print(f"Replayed: {_time_summary(result.times)}.")
+    delta = (result.times.mean() / result.recorded_times.mean() - 1) * 100
+    print(f"Mean latency delta: {delta:+.1f}%.")
+    return 1 if result.divergences else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="record synthetic episodes")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--episodes", type=int, default=1)
+    record_parser.add_argument("--steps", type=int, default=300)
+
+    replay_parser = subparsers.add_parser("replay", help="replay a trace")
+    replay_parser.add_argument("path")
+    replay_parser.add_argument("--start", type=int, default=0)
+    replay_parser.add_argument("--stop", type=int, default=None)
+    replay_parser.add_argument(
+        "--resync",
+        action="store_true",
+        help="restore the recorded decision state before every step",
+    )
+
+    sys.exit(main(parser.parse_args()))